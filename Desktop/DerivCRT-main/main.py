@@ -1,10 +1,11 @@
+from candle_store import CandleStore
 from deriv_ws import DerivLiveStreamer
 from live_plot import LiveCandlePlot
 from pattern_detector import CRTStrategy
 
 symbol = "R_75"
 
-candles = []
+candles = CandleStore(200)
 signals = []
 
 strategy = CRTStrategy(candles)
@@ -14,9 +15,6 @@ def on_new_candle(candle):
 
     candles.append(candle)
 
-    if len(candles) > 200:
-        candles.pop(0)
-
     signals = strategy.run()
 
 def get_candles():
@@ -0,0 +1,119 @@
+from collections import deque
+
+
+class TickCache:
+    """
+    Recent ticks per symbol, in the order they reached the candle builder,
+    and the newest epoch seen per symbol.
+    """
+
+    def __init__(self, maxlen=10000):
+        self.maxlen = maxlen
+        self._ticks = {}
+        self._last = {}
+
+    def last_epoch(self, symbol):
+        return self._last.get(symbol)
+
+    def add(self, symbol, epoch, price):
+        self._ticks.setdefault(symbol, deque(maxlen=self.maxlen)).append((epoch, price))
+        last = self._last.get(symbol)
+        if last is None or epoch > last:
+            self._last[symbol] = epoch
+
+    def ticks(self, symbol, since=None):
+        return [(e, p) for e, p in self._ticks.get(symbol, ()) if since is None or e > since]
+
+
+class GapBackfiller:
+    """
+    Sits between the live tick subscription and the candle builder and
+    closes the hole a reconnect leaves in the tick stream.
+
+    Live ticks go through tick() unchanged, late and out-of-order ones
+    included; the candle builder deals with those. backfill() (registered as
+    a DerivClient on_reconnect hook) holds back the live ticks of each
+    symbol and fetches everything after the newest processed epoch with
+    ticks_history. It then feeds the fetched ticks in epoch order, followed
+    by the held ones in arrival order, minus any tick already fetched or
+    already processed before the drop (resubscribing repeats the last tick).
+    The builder therefore sees the same ticks, in the same order, as it
+    would have without the outage.
+
+    :param on_tick: callable(symbol, price, epoch), the candle builder
+    """
+
+    def __init__(self, symbols, on_tick, cache=None, page_size=5000, max_pages=20):
+        self.symbols = list(symbols)
+        self.on_tick = on_tick
+        self.cache = cache or TickCache()
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+        self._held = {}  # symbol → live ticks received while its backfill runs
+        self.backfilled = 0
+
+    def tick(self, symbol, price, epoch):
+        held = self._held.get(symbol)
+        if held is not None:
+            held.append((epoch, price))
+            return
+        self._feed(symbol, price, epoch)
+
+    def _feed(self, symbol, price, epoch):
+        self.cache.add(symbol, epoch, price)
+        self.on_tick(symbol, price, epoch)
+
+    def backfill(self, client):
+        """
+        on_reconnect hook. Holding starts as soon as it is called, before the
+        returned coroutine first runs, so no live tick gets ahead of the gap.
+        """
+        symbols = [s for s in self.symbols if self.cache.last_epoch(s) is not None]
+        for symbol in symbols:
+            self._held.setdefault(symbol, [])
+        return self._backfill(client, symbols)
+
+    async def _backfill(self, client, symbols):
+        for symbol in symbols:
+            try:
+                fetched = await self._fetch(client, symbol, self.cache.last_epoch(symbol))
+            except Exception as e:
+                # the candle builder forward-fills whatever could not be fetched
+                print(f"⚠️ Backfill failed for {symbol}:", e)
+                fetched = []
+            self._release(symbol, fetched)
+
+    def _release(self, symbol, fetched):
+        last = self.cache.last_epoch(symbol)
+        fetched = sorted({epoch: price for epoch, price in fetched if epoch > last}.items())
+        seen = {epoch for epoch, _ in self.cache.ticks(symbol)}
+        seen.update(epoch for epoch, _ in fetched)
+
+        for epoch, price in fetched:
+            self._feed(symbol, price, epoch)
+        for epoch, price in self._held.pop(symbol, ()):
+            if epoch not in seen:
+                seen.add(epoch)
+                self._feed(symbol, price, epoch)
+        self.backfilled += len(fetched)
+
+    async def _fetch(self, client, symbol, last_epoch):
+        """All ticks after last_epoch, paging back from "latest" (ticks_history returns the newest `count`)."""
+        ticks = []
+        end = "latest"
+        for _ in range(self.max_pages):
+            msg = await client.request({
+                "ticks_history": symbol,
+                "start": last_epoch + 1,
+                "end": end,
+                "style": "ticks",
+                "count": self.page_size,
+            })
+            history = msg.get("history", {})
+            page = [(int(t), float(p)) for t, p in zip(history.get("times", ()), history.get("prices", ()))]
+            ticks.extend(page)
+            if len(page) < self.page_size or page[0][0] <= last_epoch + 1:
+                break
+            end = page[0][0] - 1
+        return ticks
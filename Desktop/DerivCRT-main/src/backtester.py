@@ -0,0 +1,219 @@
+import sys
+
+import numpy as np
+
+from candle_store import as_window
+from data_simulator import DataSimulator
+from pattern_detector import IncrementalCRTScorer
+from strategy import calculate_levels
+
+
+class Backtester:
+    """
+    Event-driven backtest of CRTStrategy signals.
+
+    Candles are fed one at a time through on_candle(), exactly as a live
+    stream would deliver them, but without any waiting:
+
+    1. an open position is checked against the bar's high/low; when SL and TP
+       both fall inside one bar the SL is assumed to fill first (worst case)
+    2. the bar is scored with an IncrementalCRTScorer
+    3. on a "valid" signal with no open position, a trade is opened at the
+       close with calculate_levels(); CRTStrategy does not pick a direction,
+       so it follows the signal candle (close >= open → buy, else sell)
+
+    PnL is in price units per unit traded.
+
+    :param scorer: object with update(candle) -> run() style result list
+    """
+
+    def __init__(self, scorer=None, levels=calculate_levels):
+        self.scorer = scorer or IncrementalCRTScorer()
+        self.levels = levels
+
+        self.bars = 0
+        self.position = None
+        self.trades = []
+
+        self.equity = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+
+    # ----------------------------
+    # EVENT HANDLER
+    # ----------------------------
+    def on_candle(self, candle):
+        index = self.bars
+        self.bars += 1
+
+        if self.position is not None:
+            self._check_exit(index, candle)
+
+        result = self.scorer.update(candle)[0]
+        if result["type"] == "valid" and self.position is None:
+            self._open(index, candle, result["score"])
+
+    def run(self, candles):
+        """Replay an iterable of candle dicts and return the report."""
+        for candle in candles:
+            self.on_candle(candle)
+        return self.report()
+
+    # ----------------------------
+    # POSITIONS
+    # ----------------------------
+    def _open(self, index, candle, score):
+        direction = "buy" if candle["close"] >= candle["open"] else "sell"
+        levels = self.levels(candle, direction)
+        if levels is None or levels["sl"] == levels["entry"]:
+            return  # flat candle: no risk can be defined
+
+        self.position = {
+            "direction": direction,
+            "entry_index": index,
+            "score": score,
+            **levels,
+        }
+
+    def _check_exit(self, index, candle):
+        pos = self.position
+        if pos["direction"] == "buy":
+            hit_sl = candle["low"] <= pos["sl"]
+            hit_tp = candle["high"] >= pos["tp"]
+        else:
+            hit_sl = candle["high"] >= pos["sl"]
+            hit_tp = candle["low"] <= pos["tp"]
+
+        if not (hit_sl or hit_tp):
+            return
+
+        exit_price = pos["sl"] if hit_sl else pos["tp"]
+        pnl = exit_price - pos["entry"] if pos["direction"] == "buy" else pos["entry"] - exit_price
+
+        self.trades.append({
+            **pos,
+            "exit_index": index,
+            "exit": exit_price,
+            "reason": "sl" if hit_sl else "tp",
+            "pnl": pnl,
+        })
+        self.position = None
+
+        self.equity += pnl
+        self.peak = max(self.peak, self.equity)
+        self.max_drawdown = max(self.max_drawdown, self.peak - self.equity)
+
+    # ----------------------------
+    # REPORT
+    # ----------------------------
+    def report(self):
+        return make_report(self.bars, self.trades, self.equity, self.max_drawdown, self.position is not None)
+
+
+def make_report(bars, trades, pnl, max_drawdown, open_position):
+    wins = sum(1 for t in trades if t["pnl"] > 0)
+    return {
+        "bars": bars,
+        "trades": len(trades),
+        "wins": wins,
+        "losses": len(trades) - wins,
+        "win_rate": wins / len(trades) if trades else 0.0,
+        "pnl": pnl,
+        "max_drawdown": max_drawdown,
+        "open_position": open_position,
+    }
+
+
+# ----------------------------
+# ARRAY BACKTEST
+# ----------------------------
+def backtest_series(ohlc, valid, levels=calculate_levels):
+    """
+    Backtester.run() for precomputed signals, e.g. score_series(...)["valid"].
+
+    Same rules and same report, but it only loops over trades: entries come
+    from the signal array and each exit is found with a vectorized scan, so
+    a sweep over many parameter sets stays cheap.
+    Returns (report, trades).
+    """
+    candles = as_window(ohlc)
+    o, h, l, c = candles.open, candles.high, candles.low, candles.close
+    n = len(c)
+    entries = np.flatnonzero(valid)
+
+    trades = []
+    equity = peak = max_drawdown = 0.0
+    open_position = False
+    start = 0  # first bar a new position may open on
+
+    while True:
+        k = int(np.searchsorted(entries, start))
+        if k == len(entries):
+            break
+        i = int(entries[k])
+
+        candle = {"open": float(o[i]), "high": float(h[i]), "low": float(l[i]), "close": float(c[i])}
+        direction = "buy" if candle["close"] >= candle["open"] else "sell"
+        pos = levels(candle, direction)
+        if pos is None or pos["sl"] == pos["entry"]:
+            start = i + 1
+            continue
+
+        j = _first_exit(h, l, i + 1, direction, pos["sl"], pos["tp"])
+        if j is None:
+            open_position = True
+            break
+
+        if direction == "buy":
+            hit_sl = l[j] <= pos["sl"]
+        else:
+            hit_sl = h[j] >= pos["sl"]
+        exit_price = pos["sl"] if hit_sl else pos["tp"]
+        pnl = exit_price - pos["entry"] if direction == "buy" else pos["entry"] - exit_price
+
+        trades.append({
+            "direction": direction,
+            "entry_index": i,
+            **pos,
+            "exit_index": j,
+            "exit": exit_price,
+            "reason": "sl" if hit_sl else "tp",
+            "pnl": pnl,
+        })
+
+        equity += pnl
+        peak = max(peak, equity)
+        max_drawdown = max(max_drawdown, peak - equity)
+
+        # the live backtester checks exits before entries, so the exit bar can open the next trade
+        start = j
+
+    return make_report(n, trades, equity, max_drawdown, open_position), trades
+
+
+def _first_exit(high, low, start, direction, sl, tp, chunk=64):
+    """Index of the first bar from `start` touching sl or tp, or None."""
+    n = len(high)
+    while start < n:
+        end = min(n, start + chunk)
+        if direction == "buy":
+            hit = (low[start:end] <= sl) | (high[start:end] >= tp)
+        else:
+            hit = (high[start:end] >= sl) | (low[start:end] <= tp)
+        found = np.flatnonzero(hit)
+        if len(found):
+            return start + int(found[0])
+        start = end
+        chunk *= 4
+    return None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python backtester.py candles.csv")
+        sys.exit(2)
+
+    report = Backtester().run(DataSimulator(sys.argv[1]).candles())
+    print("📊 BACKTEST")
+    for key, value in report.items():
+        print(f"  {key}: {value}")
@@ -0,0 +1,125 @@
+import numpy as np
+
+from candle_store import CandleStore
+
+# name → bar duration in seconds
+TIMEFRAMES = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "H1": 3600,
+    "H4": 14400,
+}
+
+
+class TimeframeAggregator:
+    """
+    Builds bars on several timeframes for many symbols from one tick stream.
+
+    Every tick is applied once to all timeframes of its symbol. Bars are
+    aligned to epoch boundaries (bar = epoch // duration), so an H4 bar always
+    spans 00:00-04:00 UTC and so on, and all timeframes agree with the ticks.
+    The forming bars live in one (symbols, timeframes, 4) array; closed bars
+    go to a CandleStore per symbol and timeframe.
+
+    A bar closes when the first tick of a later bar arrives; on_tick()
+    returns the closed (timeframe, candle) pairs and every on_bar_close
+    listener is called with (symbol, timeframe, candle). Intervals without
+    ticks are emitted as flat bars at the previous close (marked "filled"),
+    so every timeframe has exactly one bar per interval.
+
+    Out-of-order ticks cost O(1) like any other: they still widen the
+    high/low of every bar that is forming, but never move its close, which
+    always comes from the newest tick. A tick for an already closed bar only
+    updates the higher timeframes still forming and is counted in late_ticks.
+    """
+
+    def __init__(self, symbols, timeframes=TIMEFRAMES, capacity=500):
+        self.symbols = list(symbols)
+        self.timeframes = list(timeframes)
+        self.durations = np.array([timeframes[tf] for tf in self.timeframes], dtype=np.int64)
+        self._row = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        shape = (len(self.symbols), len(self.timeframes))
+        self._bucket = np.full(shape, -1, dtype=np.int64)  # bar index of the forming bar, -1 = none yet
+        self._ohlc = np.zeros(shape + (4,), dtype=np.float64)
+        self._last_epoch = np.full(len(self.symbols), -1, dtype=np.int64)
+
+        self.stores = {
+            (symbol, tf): CandleStore(capacity) for symbol in self.symbols for tf in self.timeframes
+        }
+        self._listeners = []
+
+        self.late_ticks = 0
+
+    def on_bar_close(self, callback):
+        """Register callback(symbol, timeframe, candle) for every closed bar."""
+        self._listeners.append(callback)
+
+    def store(self, symbol, timeframe):
+        return self.stores[(symbol, timeframe)]
+
+    def forming(self, symbol, timeframe):
+        """The bar still being built, as a candle dict, or None."""
+        row, t = self._row[symbol], self.timeframes.index(timeframe)
+        if self._bucket[row, t] < 0:
+            return None
+        return self._candle(row, t, self._bucket[row, t])
+
+    def on_tick(self, symbol, price, epoch):
+        """Apply one tick to every timeframe; returns [(timeframe, closed candle), ...]."""
+        row = self._row[symbol]
+        buckets = epoch // self.durations
+        current = self._bucket[row]
+        ohlc = self._ohlc[row]
+
+        in_order = epoch >= self._last_epoch[row]
+        if in_order:
+            self._last_epoch[row] = epoch
+
+        late = None
+        if not in_order:
+            late = buckets < current
+            if late.any():
+                # its bar has closed already; higher timeframes may still be forming
+                self.late_ticks += 1
+                if late.all():
+                    return []
+
+        # only an in-order tick can start a later bar
+        closed = []
+        for t in np.flatnonzero(buckets > current).tolist():
+            if current[t] >= 0:
+                store = self.stores[(symbol, self.timeframes[t])]
+                candle = self._candle(row, t, current[t])
+                store.append(candle)
+                closed.append((self.timeframes[t], candle))
+
+                # forward-fill intervals that had no ticks
+                last_close = candle["close"]
+                duration = int(self.durations[t])
+                for bucket in range(int(current[t]) + 1, int(buckets[t])):
+                    filler = {"open": last_close, "high": last_close, "low": last_close,
+                              "close": last_close, "epoch": bucket * duration, "filled": True}
+                    store.append(filler)
+                    closed.append((self.timeframes[t], filler))
+            ohlc[t] = price
+            current[t] = buckets[t]
+
+        if in_order:
+            np.maximum(ohlc[:, 1], price, out=ohlc[:, 1])
+            np.minimum(ohlc[:, 2], price, out=ohlc[:, 2])
+            ohlc[:, 3] = price
+        else:
+            forming = ~late
+            np.maximum(ohlc[:, 1], price, out=ohlc[:, 1], where=forming)
+            np.minimum(ohlc[:, 2], price, out=ohlc[:, 2], where=forming)
+
+        for timeframe, candle in closed:
+            for callback in self._listeners:
+                callback(symbol, timeframe, candle)
+        return closed
+
+    def _candle(self, row, t, bucket):
+        o, h, l, c = self._ohlc[row, t].tolist()
+        return {"open": o, "high": h, "low": l, "close": c, "epoch": int(bucket * self.durations[t])}
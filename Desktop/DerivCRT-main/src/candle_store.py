@@ -0,0 +1,98 @@
+from collections import namedtuple
+
+import numpy as np
+
+FIELDS = ("open", "high", "low", "close", "epoch")
+
+# A window of candles as parallel arrays: window.high[-1] is the newest high
+Candles = namedtuple("Candles", FIELDS)
+
+
+class CandleStore:
+    """
+    Fixed-size candle history backed by preallocated NumPy columns.
+
+    Memory is allocated once; append() is O(1) and never moves existing
+    candles. The buffer is mirrored: every candle is written at `head` and at
+    `head + capacity`, so the newest n candles are always one contiguous
+    slice and window() returns views instead of copies.
+
+    :param capacity: number of candles kept; older ones are overwritten
+    """
+
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self._data = np.zeros((len(FIELDS), 2 * capacity), dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+    @classmethod
+    def from_candles(cls, candles, capacity=None):
+        store = cls(capacity or max(len(candles), 1))
+        for candle in candles:
+            store.append(candle)
+        return store
+
+    def __len__(self):
+        return self._count
+
+    def append(self, candle):
+        """Append a candle dict with open/high/low/close (and optionally epoch)."""
+        self.append_values(candle["open"], candle["high"], candle["low"], candle["close"], candle.get("epoch", 0))
+
+    def append_values(self, open_, high, low, close, epoch=0):
+        row = (open_, high, low, close, epoch)
+        self._data[:, self._head] = row
+        self._data[:, self._head + self.capacity] = row
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def window(self, n=None):
+        """The newest n candles (all by default) as Candles of read-only views."""
+        n = self._count if n is None else min(n, self._count)
+        end = self._head + self.capacity
+        view = self._data[:, end - n:end]
+        view.flags.writeable = False
+        return Candles(*view)
+
+    def last(self):
+        """The newest candle as a dict, or None."""
+        if not self._count:
+            return None
+        column = self._data[:, (self._head - 1) % self.capacity]
+        candle = dict(zip(FIELDS, column.tolist()))
+        candle["epoch"] = int(candle["epoch"])
+        return candle
+
+    def to_dicts(self, n=None):
+        """The newest n candles as a list of dicts, e.g. for JSON."""
+        window = self.window(n)
+        epochs = window.epoch.astype(np.int64).tolist()
+        return [
+            {"open": o, "high": h, "low": l, "close": c, "epoch": e}
+            for o, h, l, c, e in zip(window.open.tolist(), window.high.tolist(),
+                                     window.low.tolist(), window.close.tolist(), epochs)
+        ]
+
+
+def as_window(candles, n=None):
+    """
+    Candles for the newest n entries of a CandleStore, a Candles window, a
+    dict of open/high/low/close(/epoch) arrays or a plain list of candle dicts.
+    """
+    if isinstance(candles, CandleStore):
+        return candles.window(n)
+    if isinstance(candles, dict):
+        size = len(candles["close"])
+        candles = Candles(*(
+            np.asarray(candles[field] if field in candles else np.zeros(size), dtype=np.float64)
+            for field in FIELDS
+        ))
+    if isinstance(candles, Candles):
+        return candles if n is None else Candles(*(column[len(column) - min(n, len(column)):] for column in candles))
+
+    tail = candles if n is None else candles[len(candles) - min(n, len(candles)):]
+    return Candles(*(
+        np.array([c.get(field, 0) for c in tail], dtype=np.float64) for field in FIELDS
+    ))
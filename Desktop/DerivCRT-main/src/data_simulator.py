@@ -26,24 +26,27 @@ class DataSimulator:
         self._stop_event.set()
         self._thread.join()
 
-    def _simulate_data(self):
-        """Internal method to simulate streaming data."""
+    def candles(self):
+        """Yield every candle of the CSV as fast as it can be read (no sleeping)."""
         with open(self.filepath, 'r') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                if self._stop_event.is_set():
-                    break
-
                 # Convert values
-                candle = {
-                    'timestamp': datetime.strptime(row['timestamp'], '%Y-%m-%d %H:%M:%S'),
+                yield {
+                    'timestamp': datetime.fromisoformat(row['timestamp']),  # 'YYYY-MM-DD HH:MM:SS', ~10x faster than strptime
                     'open': float(row['open']),
                     'high': float(row['high']),
                     'low': float(row['low']),
                     'close': float(row['close']),
                 }
 
-                if self.callback:
-                    self.callback(candle)
+    def _simulate_data(self):
+        """Internal method to simulate streaming data."""
+        for candle in self.candles():
+            if self._stop_event.is_set():
+                break
+
+            if self.callback:
+                self.callback(candle)
 
-                time.sleep(self.interval)
+            time.sleep(self.interval)
@@ -0,0 +1,228 @@
+import asyncio
+import itertools
+import json
+import random
+
+import websockets
+
+DERIV_URL = "wss://ws.binaryws.com/websockets/v3?app_id={app_id}"
+
+
+class DerivAPIError(Exception):
+    def __init__(self, error):
+        super().__init__(f"{error.get('code')}: {error.get('message')}")
+        self.code = error.get("code")
+
+
+class Subscription:
+    """
+    Messages of one Deriv subscription, in a bounded queue. API errors arrive
+    as messages with an "error" key.
+
+    When the consumer falls behind the oldest messages are dropped (and
+    counted), so a slow consumer never stalls the shared socket reader.
+    Iterate with `async for msg in subscription`.
+    """
+
+    def __init__(self, client, request, maxsize):
+        self.client = client
+        self.request = request
+        self.queue = asyncio.Queue(maxsize)
+        self.active = True
+        self.id = None  # Deriv's subscription id, used to forget it
+        self.dropped = 0
+
+    def put(self, msg):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(msg)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.active and self.queue.empty():
+            raise StopAsyncIteration
+        msg = await self.queue.get()
+        if msg is None:  # woken up by cancel()
+            raise StopAsyncIteration
+        return msg
+
+    async def cancel(self):
+        await self.client.unsubscribe(self)
+
+
+class DerivClient:
+    """
+    One websocket connection to the Deriv API, shared by every request and
+    subscription.
+
+    Each outgoing message gets a unique req_id and every response (including
+    streamed subscription messages, which echo it) is routed back by that id.
+    run() keeps the connection up: after a drop it reconnects with
+    exponential backoff plus jitter and re-sends only the subscriptions that
+    are still active. Coroutines registered with on_reconnect() run after
+    that, e.g. to backfill what was missed.
+    """
+
+    def __init__(self, app_id, url=None, queue_size=1000, backoff_base=1.0, backoff_max=60.0,
+                 keepalive=30.0):
+        self.url = url or DERIV_URL.format(app_id=app_id)
+        self.queue_size = queue_size
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.keepalive = keepalive
+
+        self._ids = itertools.count(1)
+        self._pending = {}        # req_id → Future for one-shot requests
+        self._routes = {}         # req_id → Subscription
+        self._subscriptions = []  # active, in subscribe order
+        self._reconnect_hooks = []
+        self._hook_tasks = set()
+
+        self._ws = None
+        self._connected = asyncio.Event()
+        self._closing = False
+        self.connects = 0
+
+    # ----------------------------
+    # PUBLIC API
+    # ----------------------------
+    async def request(self, payload, timeout=30):
+        """Send one request and return its response; raises DerivAPIError on an API error."""
+        await self._connected.wait()
+        req_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
+        try:
+            await self._send(payload, req_id)
+            msg = await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(req_id, None)
+
+        if "error" in msg:
+            raise DerivAPIError(msg["error"])
+        return msg
+
+    async def subscribe(self, payload, queue_size=None):
+        """Start a subscription (payload without "subscribe"); returns a Subscription."""
+        sub = Subscription(self, {**payload, "subscribe": 1}, queue_size or self.queue_size)
+        self._subscriptions.append(sub)
+        if self._connected.is_set():
+            try:
+                await self._send_subscription(sub)
+            except ConnectionError:
+                pass  # sent again on reconnect
+        return sub
+
+    async def unsubscribe(self, sub):
+        if not sub.active:
+            return
+        sub.active = False
+        sub.put(None)
+        self._subscriptions.remove(sub)
+        for req_id in [r for r, s in self._routes.items() if s is sub]:
+            del self._routes[req_id]
+        if sub.id and self._connected.is_set():
+            try:
+                await self.request({"forget": sub.id})
+            except (DerivAPIError, ConnectionError, asyncio.TimeoutError):
+                pass  # the stream is gone either way
+
+    def on_reconnect(self, hook):
+        """Register `async hook(client)`, awaited after every reconnect (not the first connect)."""
+        self._reconnect_hooks.append(hook)
+
+    async def close(self):
+        self._closing = True
+        if self._ws is not None:
+            await self._ws.close()
+
+    # ----------------------------
+    # CONNECTION LOOP
+    # ----------------------------
+    async def run(self):
+        attempt = 0
+        while not self._closing:
+            try:
+                async with websockets.connect(self.url, ping_interval=None, close_timeout=5) as ws:
+                    self._ws = ws
+                    self.connects += 1
+                    attempt = 0
+                    await self._on_connect()
+                    await self._read_loop(ws)
+            except Exception as e:
+                # network errors, but also a malformed frame: reconnect either way
+                if self._closing:
+                    break
+                print("🔄 Reconnecting WebSocket...", e)
+            finally:
+                self._on_disconnect()
+
+            if self._closing:
+                break
+            delay = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _on_connect(self):
+        self._connected.set()
+        for sub in list(self._subscriptions):
+            await self._send_subscription(sub)
+        if self.connects > 1:
+            for hook in self._reconnect_hooks:
+                task = asyncio.create_task(hook(self))
+                self._hook_tasks.add(task)
+                task.add_done_callback(self._hook_tasks.discard)
+
+    def _on_disconnect(self):
+        self._ws = None
+        self._connected.clear()
+        self._routes.clear()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Deriv connection lost"))
+        self._pending.clear()
+
+    async def _read_loop(self, ws):
+        while True:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=self.keepalive)
+            except asyncio.TimeoutError:
+                # quiet socket: an API-level ping keeps the session alive
+                await self._send({"ping": 1}, next(self._ids))
+                continue
+            self._dispatch(json.loads(raw))
+
+    def _dispatch(self, msg):
+        req_id = msg.get("req_id")
+
+        future = self._pending.get(req_id)
+        if future is not None:
+            if not future.done():
+                future.set_result(msg)
+            return
+
+        sub = self._routes.get(req_id)
+        if sub is None:
+            return  # forgotten subscription, keep-alive pong, ...
+        if "subscription" in msg:
+            sub.id = msg["subscription"]["id"]
+        sub.put(msg)
+
+    async def _send_subscription(self, sub):
+        req_id = next(self._ids)
+        self._routes[req_id] = sub
+        await self._send(sub.request, req_id)
+
+    async def _send(self, payload, req_id):
+        if self._ws is None:
+            raise ConnectionError("Deriv connection lost")
+        try:
+            await self._ws.send(json.dumps({**payload, "req_id": req_id}))
+        except websockets.ConnectionClosed as e:
+            raise ConnectionError("Deriv connection lost") from e
@@ -1,63 +1,81 @@
-import websocket
+import asyncio
 import threading
-import json
-import time
+
+from deriv_client import DerivClient
+
 
 class DerivLiveStreamer:
+    """
+    Closed candles for one symbol, delivered to `callback` from a background
+    thread. Runs a DerivClient (one multiplexed, auto-reconnecting connection)
+    on its own event loop, so callers stay synchronous.
+
+    Deriv streams the forming candle on every tick ("ohlc" messages); a candle
+    is passed to the callback once, when the next one opens.
+    """
+
     def __init__(self, app_id, symbol, granularity, callback):
-        self.url = f"wss://ws.binaryws.com/websockets/v3?app_id={app_id}"
+        self.app_id = app_id
         self.symbol = symbol
         self.granularity = granularity
         self.callback = callback
-        self.ws = None
+        self.client = None
         self.running = False
+        self._loop = None
+        self._subscription = None
+        self._forming = None
 
     def start(self):
         self.running = True
-        thread = threading.Thread(target=self._run)
+        thread = threading.Thread(target=self._run, daemon=True)
         thread.start()
 
     def _run(self):
-        self.ws = websocket.WebSocketApp(
-            self.url,
-            on_open=self._on_open,
-            on_message=self._on_message,
-            on_error=self._on_error,
-            on_close=self._on_close
-        )
-        while self.running:
-            self.ws.run_forever()
-            time.sleep(5)
-
-    def _on_open(self, ws):
-        print("[Connected to Deriv WS]")
-        req = {
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._stream())
+        finally:
+            self._loop.close()
+
+    async def _stream(self):
+        self.client = DerivClient(self.app_id)
+        runner = asyncio.create_task(self.client.run())
+
+        self._subscription = await self.client.subscribe({
             "ticks_history": self.symbol,
             "end": "latest",
             "count": 1,
-            "subscribe": 1,
             "granularity": self.granularity,
             "style": "candles"
+        })
+        # if the connection loop ever ends, end the subscription too instead of waiting forever
+        runner.add_done_callback(lambda _: self._subscription.put(None))
+        try:
+            async for msg in self._subscription:
+                if "error" in msg:
+                    print("[WS Error]:", msg["error"].get("message"))
+                elif msg.get("candles"):
+                    self._on_candle(msg["candles"][-1], msg["candles"][-1]["epoch"])
+                elif msg.get("ohlc"):
+                    self._on_candle(msg["ohlc"], msg["ohlc"]["open_time"])
+        finally:
+            await self.client.close()
+            await runner
+
+    def _on_candle(self, c, epoch):
+        candle = {
+            "open": float(c["open"]),
+            "high": float(c["high"]),
+            "low": float(c["low"]),
+            "close": float(c["close"]),
+            "epoch": int(epoch)
         }
-        ws.send(json.dumps(req))
-
-    def _on_message(self, ws, message):
-        data = json.loads(message)
-        if data.get("candles"):
-            c = data["candles"][-1]
-            candle = {
-                "open": float(c["open"]),
-                "high": float(c["high"]),
-                "low": float(c["low"]),
-                "close": float(c["close"]),
-                "epoch": c["epoch"]
-            }
-            self.callback(candle)
-
-    def _on_error(self, ws, err): print("[WS Error]:", err)
-    def _on_close(self, ws, *args): print("[WS Closed]")
+        if self._forming is not None and candle["epoch"] > self._forming["epoch"]:
+            self.callback(self._forming)
+        if self._forming is None or candle["epoch"] >= self._forming["epoch"]:
+            self._forming = candle
 
     def stop(self):
         self.running = False
-        if self.ws:
-            self.ws.close()
+        if self._subscription is not None:
+            asyncio.run_coroutine_threadsafe(self._subscription.cancel(), self._loop)
@@ -2,6 +2,8 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.patches import Rectangle
 
+from candle_store import as_window
+
 class LiveCandlePlot:
     def __init__(self, get_candles_callback, get_trade_signals_callback=None):
         self.get_candles = get_candles_callback
@@ -11,14 +13,15 @@ class LiveCandlePlot:
 
     def update(self, frame):
         candles = self.get_candles()
-        if not candles:
+        if not len(candles):
             return
         self.ax.clear()
-        x = range(len(candles))
-        opens = [c['open'] for c in candles]
-        highs = [c['high'] for c in candles]
-        lows = [c['low'] for c in candles]
-        closes = [c['close'] for c in candles]
+        window = as_window(candles)
+        x = range(len(window.close))
+        opens = window.open.tolist()
+        highs = window.high.tolist()
+        lows = window.low.tolist()
+        closes = window.close.tolist()
 
         for i in x:
             color = 'green' if closes[i] >= opens[i] else 'red'
@@ -0,0 +1,230 @@
+"""
+Walk-forward parameter sweep for CRTStrategy.
+
+    python optimizer.py candles.csv
+    python optimizer.py candles.csv --grid grid.json --folds 6 --workers 8 --results sweep.jsonl
+
+The grid is a JSON object mapping CRTParams fields to lists of values; fields
+left out keep their default. Every configuration is backtested on the train
+and the test part of each walk-forward fold, and the leaderboard ranks them by
+mean out-of-sample (test) PnL.
+"""
+import argparse
+import heapq
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backtester import backtest_series
+from candle_store import Candles
+from data_simulator import DataSimulator
+from pattern_detector import DEFAULT_PARAMS, CRTParams, score_series
+
+DEFAULT_GRID = {
+    "structure": [0.4, 0.5, 0.6],
+    "momentum": [0.1, 0.2, 0.3],
+    "ob": [0.1, 0.15, 0.2],
+    "volatility": [0.05, 0.1],
+    "threshold": [0.65, 0.7, 0.75, 0.8],
+    "min_range": [0.5, 1, 2],
+}
+
+OHLC = ("open", "high", "low", "close")
+
+
+# ----------------------------
+# PARAMETERS / SPLITS
+# ----------------------------
+def grid_params(grid):
+    fields = [f for f in CRTParams._fields if f in grid]
+    for values in itertools.product(*(grid[f] for f in fields)):
+        yield DEFAULT_PARAMS._replace(**dict(zip(fields, values)))
+
+
+def walk_forward_splits(n, folds=5, train_ratio=0.7):
+    """[(train_start, train_end, test_end), ...]: consecutive folds, each split train → test."""
+    size = n // folds
+    splits = []
+    for k in range(folds):
+        start = k * size
+        end = n if k == folds - 1 else start + size
+        splits.append((start, start + int((end - start) * train_ratio), end))
+    return splits
+
+
+# ----------------------------
+# SHARED PRICE ARRAYS
+# ----------------------------
+_shared = None  # (SharedMemory, (4, N) float64 view) in each worker
+
+
+def share_prices(candles):
+    """Copy the OHLC columns into one shared memory block; returns (block, array view)."""
+    columns = np.stack([np.asarray(getattr(candles, f), dtype=np.float64) for f in OHLC])
+    block = shared_memory.SharedMemory(create=True, size=columns.nbytes)
+    prices = np.ndarray(columns.shape, dtype=np.float64, buffer=block.buf)
+    prices[:] = columns
+    return block, prices
+
+
+def _attach(name, shape):
+    global _shared
+    block = shared_memory.SharedMemory(name=name)
+    prices = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+    prices.flags.writeable = False
+    _shared = (block, prices)
+
+
+# ----------------------------
+# EVALUATION
+# ----------------------------
+def evaluate(params, prices, splits):
+    """Per-fold train/test backtest reports for one configuration."""
+    folds = []
+    for start, split, end in splits:
+        fold = {}
+        for part, (a, b) in (("train", (start, split)), ("test", (split, end))):
+            window = Candles(*prices[:, a:b], epoch=None)
+            report, _ = backtest_series(window, score_series(window, params)["valid"])
+            fold[part] = report
+        folds.append(fold)
+
+    test = [f["test"] for f in folds]
+    return {
+        "params": params._asdict(),
+        "train_pnl": float(np.mean([f["train"]["pnl"] for f in folds])),
+        "test_pnl": float(np.mean([r["pnl"] for r in test])),
+        "test_win_rate": float(np.mean([r["win_rate"] for r in test])),
+        "test_max_drawdown": float(max(r["max_drawdown"] for r in test)),
+        "test_trades": int(sum(r["trades"] for r in test)),
+        "fold_train_pnl": [f["train"]["pnl"] for f in folds],
+        "fold_test_pnl": [r["pnl"] for r in test],
+    }
+
+
+def _evaluate_batch(batch, splits):
+    prices = _shared[1]
+    return [evaluate(params, prices, splits) for params in batch]
+
+
+class Leaderboard:
+    """Top `size` results by test PnL, updated as results stream in."""
+
+    def __init__(self, size=10):
+        self.size = size
+        self.evaluated = 0
+        self._heap = []  # (test_pnl, seq, result), smallest first
+
+    def add(self, result):
+        """Returns True when the result entered the board."""
+        self.evaluated += 1
+        entry = (result["test_pnl"], self.evaluated, result)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def ranked(self):
+        return [r for _, _, r in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+
+def walk_forward_pnl(results, folds):
+    """Out-of-sample PnL when each fold trades the configuration that was best on its train part."""
+    total = 0.0
+    for k in range(folds):
+        best = max(results, key=lambda r: r["fold_train_pnl"][k])
+        total += best["fold_test_pnl"][k]
+    return total
+
+
+def sweep(candles, grid, folds=5, workers=None, batch_size=16, board=None, on_result=None):
+    """
+    Evaluate every grid configuration over a ProcessPoolExecutor.
+
+    The price columns are placed in shared memory once; workers attach to it
+    read-only instead of receiving pickled arrays with every task.
+    `on_result(result, entered_board)` is called as results arrive.
+    """
+    board = board or Leaderboard()
+    splits = walk_forward_splits(len(candles.close), folds)
+    configs = list(grid_params(grid))
+    block, prices = share_prices(candles)
+
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(block.name, prices.shape)) as pool:
+            futures = [
+                pool.submit(_evaluate_batch, configs[i:i + batch_size], splits)
+                for i in range(0, len(configs), batch_size)
+            ]
+            for future in as_completed(futures):
+                for result in future.result():
+                    results.append(result)
+                    entered = board.add(result)
+                    if on_result:
+                        on_result(result, entered)
+    finally:
+        block.close()
+        block.unlink()
+
+    return board, results
+
+
+def print_board(board):
+    for rank, r in enumerate(board.ranked(), 1):
+        params = ", ".join(f"{k}={v}" for k, v in r["params"].items())
+        print(f"{rank:>3}. test {r['test_pnl']:+.2f}  train {r['train_pnl']:+.2f}  "
+              f"win {r['test_win_rate']:.0%}  dd {r['test_max_drawdown']:.2f}  | {params}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", help="candles CSV (timestamp,open,high,low,close)")
+    parser.add_argument("--grid", help="JSON parameter grid (default: DEFAULT_GRID)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--results", help="append every result to this JSON lines file")
+    args = parser.parse_args(argv)
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    rows = list(DataSimulator(args.csv).candles())
+    if len(rows) < args.folds * 40:
+        parser.error(f"{len(rows)} candles are too few for {args.folds} folds")
+    candles = Candles(*(np.array([r[f] for r in rows], dtype=np.float64) for f in OHLC), epoch=None)
+
+    out = open(args.results, "a") if args.results else None
+
+    def on_result(result, entered):
+        if out:
+            out.write(json.dumps(result) + "\n")
+        if entered:
+            best = board.ranked()[0]
+            print(f"🏁 {board.evaluated} evaluated | best test PnL {best['test_pnl']:+.2f}")
+
+    board = Leaderboard(args.top)
+    try:
+        _, results = sweep(candles, grid, args.folds, args.workers, board=board, on_result=on_result)
+    finally:
+        if out:
+            out.close()
+
+    print(f"\n📊 LEADERBOARD ({len(results)} configurations, {args.folds} folds)")
+    print_board(board)
+    print(f"walk-forward PnL (best train config per fold): {walk_forward_pnl(results, args.folds):+.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,21 @@
+from collections import deque, namedtuple
+
+import numpy as np
+
+from candle_store import as_window
+
+# Scoring weights, decision threshold and the dead-market filter (minimum
+# average range over the last 10 candles)
+CRTParams = namedtuple(
+    "CRTParams",
+    ("structure", "momentum", "ob", "volatility", "crt", "threshold", "min_range"),
+)
+
+DEFAULT_PARAMS = CRTParams(
+    structure=0.5, momentum=0.2, ob=0.15, volatility=0.1, crt=0.05, threshold=0.75, min_range=1,
+)
+
+
 class CRTStrategy:
     """
     CONFIRMATION LAYER ONLY
@@ -9,10 +27,17 @@ class CRTStrategy:
 
     It ONLY answers:
     → "Is this setup high probability?"
+
+    `candles` is a CandleStore (or a list of candle dicts); every check reads
+    a NumPy window of the newest candles.
     """
 
-    def __init__(self, candles):
+    def __init__(self, candles, params=DEFAULT_PARAMS):
         self.candles = candles
+        self.params = params
+
+    def _window(self, n):
+        return as_window(self.candles, n)
 
     # ----------------------------
     # SAFETY CHECK
@@ -28,15 +53,15 @@ class CRTStrategy:
         if not self.ready():
             return 0
 
-        highs = [c["high"] for c in self.candles[-20:]]
-        lows = [c["low"] for c in self.candles[-20:]]
+        window = self._window(20)
+        highs, lows = window.high, window.low
 
         # swing consistency (trendline approximation)
-        higher_highs = sum(1 for i in range(1, len(highs)) if highs[i] > highs[i - 1])
-        higher_lows = sum(1 for i in range(1, len(lows)) if lows[i] > lows[i - 1])
+        higher_highs = int(np.count_nonzero(highs[1:] > highs[:-1]))
+        higher_lows = int(np.count_nonzero(lows[1:] > lows[:-1]))
 
-        lower_highs = sum(1 for i in range(1, len(highs)) if highs[i] < highs[i - 1])
-        lower_lows = sum(1 for i in range(1, len(lows)) if lows[i] < lows[i - 1])
+        lower_highs = int(np.count_nonzero(highs[1:] < highs[:-1]))
+        lower_lows = int(np.count_nonzero(lows[1:] < lows[:-1]))
 
         bullish_strength = (higher_highs + higher_lows) / 38
         bearish_strength = (lower_highs + lower_lows) / 38
@@ -50,10 +75,10 @@ class CRTStrategy:
         if len(self.candles) < 2:
             return 0
 
-        c = self.candles[-1]
+        c = self._window(1)
 
-        body = abs(c["close"] - c["open"])
-        rng = c["high"] - c["low"]
+        body = abs(float(c.close[0]) - float(c.open[0]))
+        rng = float(c.high[0]) - float(c.low[0])
 
         if rng == 0:
             return 0
@@ -68,11 +93,11 @@ class CRTStrategy:
             return 0
 
         # last impulse candle check
-        last = self.candles[-1]
-        prev = self.candles[-2]
+        window = self._window(2)
+        bodies = np.abs(window.close - window.open).tolist()
 
-        impulse = abs(last["close"] - last["open"])
-        prev_body = abs(prev["close"] - prev["open"])
+        impulse = bodies[1]
+        prev_body = bodies[0]
 
         if prev_body == 0:
             return 0
@@ -87,17 +112,17 @@ class CRTStrategy:
         if len(self.candles) < 3:
             return 0
 
-        c1 = self.candles[-3]
-        c2 = self.candles[-2]
-        c3 = self.candles[-1]
+        window = self._window(2)
+        highs, lows = window.high.tolist(), window.low.tolist()
+        bodies = np.abs(window.close - window.open).tolist()
 
-        # simple expansion + sweep behavior
+        # simple expansion + sweep behavior (c2 → c3)
         expansion = (
-            c3["high"] > c2["high"] and
-            c3["low"] < c2["low"]
+            highs[1] > highs[0] and
+            lows[1] < lows[0]
         )
 
-        body_strength = abs(c3["close"] - c3["open"]) > abs(c2["close"] - c2["open"])
+        body_strength = bodies[1] > bodies[0]
 
         return 1 if expansion and body_strength else 0
 
@@ -108,11 +133,13 @@ class CRTStrategy:
         if len(self.candles) < 10:
             return False
 
-        ranges = [c["high"] - c["low"] for c in self.candles[-10:]]
+        window = self._window(10)
+        ranges = (window.high - window.low).tolist()
+        # left-to-right sum, as before: other scorers must reproduce it exactly
         avg_range = sum(ranges) / len(ranges)
 
         # avoid dead markets
-        return avg_range > 1
+        return avg_range > self.params.min_range
 
     # ----------------------------
     # FINAL SCORING ENGINE
@@ -121,36 +148,209 @@ class CRTStrategy:
         if not self.ready():
             return [{"type": "none", "score": 0}]
 
-        score = 0
+        return combine_scores(
+            self.structure_score(),
+            self.momentum_quality(),
+            self.ob_quality(),
+            self.volatility_ok(),
+            self.crt_confluence(),
+            self.params,
+        )
+
 
-        # 1. structure (MOST IMPORTANT)
-        score += self.structure_score() * 0.5
+# ----------------------------
+# FINAL SCORING ENGINE
+# ----------------------------
+def combine_scores(structure, momentum, ob, volatile, crt, params=DEFAULT_PARAMS):
+    """Weighted score and decision; shared by every scorer so results stay identical."""
+    score = 0
 
-        # 2. momentum (entry quality)
-        score += self.momentum_quality() * 0.2
+    # 1. structure (MOST IMPORTANT)
+    score += structure * params.structure
 
-        # 3. order block / displacement
-        ob = self.ob_quality()
-        score += min(ob * 0.15, 0.15)
+    # 2. momentum (entry quality)
+    score += momentum * params.momentum
 
-        # 4. volatility filter
-        if self.volatility_ok():
-            score += 0.1
+    # 3. order block / displacement
+    score += min(ob * params.ob, params.ob)
 
-        # 5. CRT bonus
-        if self.crt_confluence():
-            score += 0.05
+    # 4. volatility filter
+    if volatile:
+        score += params.volatility
 
-        # ----------------------------
-        # DECISION THRESHOLD
-        # ----------------------------
-        if score >= 0.75:
-            return [{
-                "type": "valid",
-                "score": round(score, 2)
-            }]
+    # 5. CRT bonus
+    if crt:
+        score += params.crt
 
+    # ----------------------------
+    # DECISION THRESHOLD
+    # ----------------------------
+    if score >= params.threshold:
         return [{
-            "type": "none",
+            "type": "valid",
             "score": round(score, 2)
-        }]
\ No newline at end of file
+        }]
+
+    return [{
+        "type": "none",
+        "score": round(score, 2)
+    }]
+
+
+class IncrementalCRTScorer:
+    """
+    CRTStrategy.run() for a live stream, updated in O(1) per new bar.
+
+    Instead of rescanning the last 20 / 10 candles on every bar it keeps
+    running counts of higher/lower highs and lows over the structure window
+    and a rolling sum of the last 10 ranges. Results are identical to
+    CRTStrategy(candles).run() on the same candles.
+    """
+
+    STRUCTURE_BARS = 20
+    VOLATILITY_BARS = 10
+
+    def __init__(self, params=DEFAULT_PARAMS):
+        self.params = params
+        self.bars = 0
+        self._prev = None  # (open, high, low, close) of the previous bar
+
+        # one entry per consecutive pair in the structure window:
+        # (higher high, higher low, lower high, lower low)
+        self._moves = deque(maxlen=self.STRUCTURE_BARS - 1)
+        self._counts = [0, 0, 0, 0]
+
+        self._ranges = deque(maxlen=self.VOLATILITY_BARS)
+        self._range_sum = 0.0
+        self._since_resync = 0
+
+    def update(self, candle):
+        return self.update_values(candle["open"], candle["high"], candle["low"], candle["close"])
+
+    def update_values(self, open_, high, low, close):
+        """Add one closed bar and return the same result list as CRTStrategy.run()."""
+        prev = self._prev
+        self._prev = (open_, high, low, close)
+        self.bars += 1
+
+        if prev is not None:
+            move = (high > prev[1], low > prev[2], high < prev[1], low < prev[2])
+            if len(self._moves) == self._moves.maxlen:
+                for i, flag in enumerate(self._moves[0]):
+                    self._counts[i] -= flag
+            self._moves.append(move)
+            for i, flag in enumerate(move):
+                self._counts[i] += flag
+
+        rng = high - low
+        if len(self._ranges) == self._ranges.maxlen:
+            self._range_sum -= self._ranges[0]
+        self._ranges.append(rng)
+        self._range_sum += rng
+
+        # the window is fully replaced every VOLATILITY_BARS bars: resync the
+        # rolling sum then so rounding error never accumulates
+        self._since_resync += 1
+        if self._since_resync >= self.VOLATILITY_BARS:
+            self._range_sum = sum(self._ranges)
+            self._since_resync = 0
+
+        if self.bars < self.STRUCTURE_BARS:
+            return [{"type": "none", "score": 0}]
+
+        hh, hl, lh, ll = self._counts
+        structure = max((hh + hl) / 38, (lh + ll) / 38)
+
+        body = abs(close - open_)
+        momentum = body / rng if rng != 0 else 0
+
+        prev_body = abs(prev[3] - prev[0])
+        ob = body / prev_body if prev_body != 0 else 0
+
+        crt = 1 if high > prev[1] and low < prev[2] and body > prev_body else 0
+
+        return combine_scores(structure, momentum, ob, self._volatility_ok(), crt, self.params)
+
+    def _volatility_ok(self):
+        # the rolling sum can differ from a left-to-right sum in the last bits;
+        # only close to the threshold does that matter, so recompute it there
+        limit = self.VOLATILITY_BARS * self.params.min_range
+        if abs(self._range_sum - limit) > 1e-9 * max(abs(self._range_sum), abs(limit), 1):
+            return self._range_sum > limit
+        return sum(self._ranges) / len(self._ranges) > self.params.min_range
+
+# ----------------------------
+# BATCH SCORING OVER HISTORY
+# ----------------------------
+def score_series(ohlc, params=DEFAULT_PARAMS):
+    """
+    CRTStrategy scores for every bar of a history at once.
+
+    `ohlc` is anything with open/high/low/close arrays: a Candles window, a
+    CandleStore, a list of candle dicts, or a dict of arrays. Bar i gets the
+    score run() would give on candles[:i + 1]; the first 19 bars (not ready)
+    score 0. Returns a dict of arrays: structure, momentum, ob, volatile, crt,
+    score (unrounded; run() reports round(score, 2)) and valid.
+    `params` are the CRTParams used, as for CRTStrategy(candles, params).
+    """
+    candles = as_window(ohlc)
+    o, h, l, c = candles.open, candles.high, candles.low, candles.close
+    n = len(c)
+
+    structure = np.zeros(n)
+    momentum = np.zeros(n)
+    ob = np.zeros(n)
+    volatile = np.zeros(n, dtype=bool)
+    crt = np.zeros(n, dtype=bool)
+    score = np.zeros(n)
+
+    window = IncrementalCRTScorer.STRUCTURE_BARS
+    if n >= window:
+        ready = slice(window - 1, n)
+
+        # structure: per-pair moves, summed over the 19 pairs of each 20-bar window
+        def window_counts(moves):
+            totals = np.concatenate(([0], np.cumsum(moves, dtype=np.int64)))
+            return totals[window - 1:] - totals[:n - window + 1]
+
+        hh = window_counts(h[1:] > h[:-1])
+        hl = window_counts(l[1:] > l[:-1])
+        lh = window_counts(h[1:] < h[:-1])
+        ll = window_counts(l[1:] < l[:-1])
+        structure[ready] = np.maximum((hh + hl) / 38, (lh + ll) / 38)
+
+        body = np.abs(c - o)
+        rng = h - l
+        with np.errstate(divide="ignore", invalid="ignore"):
+            momentum[ready] = np.where(rng != 0, body / rng, 0.0)[ready]
+            ob[1:] = np.where(body[:-1] != 0, body[1:] / body[:-1], 0.0)
+        ob[:window - 1] = 0
+
+        # left-to-right sum of the last 10 ranges, exactly as volatility_ok() adds them
+        bars = IncrementalCRTScorer.VOLATILITY_BARS
+        range_sum = rng[:n - bars + 1].copy()
+        for k in range(1, bars):
+            range_sum += rng[k:n - bars + 1 + k]
+        volatile[bars - 1:] = range_sum / bars > params.min_range
+        volatile[:window - 1] = False
+
+        crt[1:] = (h[1:] > h[:-1]) & (l[1:] < l[:-1]) & (body[1:] > body[:-1])
+        crt[:window - 1] = False
+
+        # same operations, in the same order, as combine_scores()
+        score = 0 + structure * params.structure
+        score = score + momentum * params.momentum
+        score = score + np.minimum(ob * params.ob, params.ob)
+        score = np.where(volatile, score + params.volatility, score)
+        score = np.where(crt, score + params.crt, score)
+        score[:window - 1] = 0
+
+    return {
+        "structure": structure,
+        "momentum": momentum,
+        "ob": ob,
+        "volatile": volatile,
+        "crt": crt,
+        "score": score,
+        "valid": score >= params.threshold,
+    }
@@ -1,129 +1,99 @@
 import asyncio
-import websockets
-import json
-from pattern_detector import CRTStrategy
+from backfill import GapBackfiller, TickCache
+from candle_aggregator import TIMEFRAMES, TimeframeAggregator
+from deriv_client import DerivClient
+from pattern_detector import IncrementalCRTScorer
 
 APP_ID = 80707
 SYMBOLS = ["R_10", "R_25", "R_50", "R_75", "R_100"]
-URL = f"wss://ws.binaryws.com/websockets/v3?app_id={APP_ID}"
 
 # ----------------------------
 # STORAGE
 # ----------------------------
-symbol_candles = {s: [] for s in SYMBOLS}
+# M1/M5/M15/H1/H4 bars for every symbol, all built from the one tick stream;
+# closed bars are kept in aggregator.store(symbol, timeframe)
+aggregator = TimeframeAggregator(SYMBOLS, TIMEFRAMES, capacity=100)
 
-buffers = {
-    s: {
-        "open": None,
-        "high": None,
-        "low": None,
-        "close": None,
-        "start_epoch": None
-    } for s in SYMBOLS
-}
+# one long-lived scorer per symbol and timeframe, updated in O(1) per closed candle
+scorers = {(s, tf): IncrementalCRTScorer() for s in SYMBOLS for tf in TIMEFRAMES}
 
-CANDLE_DURATION = 60
+CANDLE_DURATION = TIMEFRAMES["M1"]
+
+# recent ticks and the last processed epoch per symbol, for gap backfill on reconnect
+tick_cache = TickCache()
 
 
 # ----------------------------
 # BUILD CANDLES
 # ----------------------------
 def update_candle_from_tick(symbol, price, epoch):
-    buf = buffers[symbol]
-
-    if buf["open"] is None:
-        buf["open"] = buf["high"] = buf["low"] = buf["close"] = price
-        buf["start_epoch"] = epoch
-        return None
-
-    buf["high"] = max(buf["high"], price)
-    buf["low"] = min(buf["low"], price)
-    buf["close"] = price
-
-    if epoch - buf["start_epoch"] >= CANDLE_DURATION:
-        candle = {
-            "open": buf["open"],
-            "high": buf["high"],
-            "low": buf["low"],
-            "close": buf["close"]
-        }
+    """
+    Feed one tick to every timeframe; returns the bars it closed as [(timeframe, candle), ...].
 
-        buf["open"] = buf["high"] = buf["low"] = buf["close"] = price
-        buf["start_epoch"] = epoch
-
-        return candle
-
-    return None
+    Bars are bucketed by epoch // duration, quiet intervals come back as flat
+    forward-filled bars and late or out-of-order ticks never shift a boundary
+    (see TimeframeAggregator).
+    """
+    return aggregator.on_tick(symbol, price, epoch)
 
 
 # ----------------------------
 # PROCESS STRATEGY
 # ----------------------------
-def process_candle(symbol, candle):
-    candles = symbol_candles[symbol]
+def process_candle(symbol, timeframe, candle):
+    result = scorers[(symbol, timeframe)].update(candle)[0]
+
+    if result["type"] == "valid":
+        print(f"🔥 SIGNAL {symbol} {timeframe} | SCORE: {result['score']}")
 
-    candles.append(candle)
-    if len(candles) > 100:
-        candles.pop(0)
 
-    strategy = CRTStrategy(candles)
-    result = strategy.run()[0]
+def handle_tick(symbol, price, epoch):
+    for timeframe, candle in update_candle_from_tick(symbol, price, epoch):
+        process_candle(symbol, timeframe, candle)
 
-    if result["type"] == "valid":
-        print(f"🔥 SIGNAL {symbol} | SCORE: {result['score']}")
+
+# live ticks pass through here; after a reconnect it fetches the missed ticks
+# with ticks_history and merges them in epoch order before the live ones
+backfiller = GapBackfiller(SYMBOLS, handle_tick, tick_cache)
 
 
 # ----------------------------
 # MAIN RUNNER
 # ----------------------------
+async def consume_ticks(subscription):
+    async for msg in subscription:
+        if "error" in msg:
+            print("⚠️ Stream error:", msg["error"].get("message"))
+            continue
+        if "tick" not in msg:
+            continue
+
+        t = msg["tick"]
+        symbol = t["symbol"]
+        price = float(t["quote"])
+        epoch = t["epoch"]
+
+        backfiller.tick(symbol, price, epoch)
+
+
 async def run():
     print("🚀 CRT ENGINE STARTED (STABLE MODE)")
 
-    while True:
-        try:
-            async with websockets.connect(
-                URL,
-                ping_interval=None,
-                close_timeout=5
-            ) as ws:
-
-                # subscribe
-                for s in SYMBOLS:
-                    await ws.send(json.dumps({
-                        "ticks": s,
-                        "subscribe": 1
-                    }))
-                    print(f"✅ Subscribed {s}")
-
-                while True:
-                    try:
-                        msg = await asyncio.wait_for(ws.recv(), timeout=30)
-                        msg = json.loads(msg)
-
-                        if "tick" not in msg:
-                            continue
-
-                        t = msg["tick"]
-                        symbol = t["symbol"]
-                        price = float(t["quote"])
-                        epoch = t["epoch"]
-
-                        candle = update_candle_from_tick(symbol, price, epoch)
-
-                        if candle:
-                            process_candle(symbol, candle)
-
-                    except asyncio.TimeoutError:
-                        await ws.ping()
-                        print("🔁 Keep-alive ping sent")
-
-                    except Exception as e:
-                        print("⚠️ Stream error:", e)
-                        break
-
-        except Exception as e:
-            print("🔄 Reconnecting WebSocket...", e)
-            await asyncio.sleep(3)
+    # one connection for every symbol; it reconnects and resubscribes by itself
+    client = DerivClient(APP_ID)
+    client.on_reconnect(backfiller.backfill)
+    connection = asyncio.create_task(client.run())
+
+    consumers = []
+    for s in SYMBOLS:
+        subscription = await client.subscribe({"ticks": s})
+        consumers.append(asyncio.create_task(consume_ticks(subscription)))
+        print(f"✅ Subscribed {s}")
+
+    try:
+        await asyncio.gather(connection, *consumers)
+    finally:
+        await client.close()
 
 
 # ----------------------------
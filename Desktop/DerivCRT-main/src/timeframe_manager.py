@@ -4,24 +4,30 @@ import time
 import random
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from candle_store import CandleStore, as_window
+
 app = Flask(__name__)
 
 # Shared candle storage
 datastore = {
-    "candles": []
+    "candles": CandleStore(100)
 }
 
 # --- CRT pattern detector ---
 def detect_crt_zones(candles):
-    if len(candles) < 3:
+    closes = as_window(candles).close
+    if len(closes) < 3:
         return []
+
+    c1, c2, c3 = closes[:-2], closes[1:-1], closes[2:]
+    buy = (c3 > c2) & (c3 > c1)
+    sell = (c3 < c2) & (c3 < c1)
+
     zones = []
-    for i in range(2, len(candles)):
-        c1, c2, c3 = candles[i-2], candles[i-1], candles[i]
-        if c3["close"] > c2["close"] and c3["close"] > c1["close"]:
-            zones.append({"index": i, "type": "buy", "price": c3["close"]})
-        elif c3["close"] < c2["close"] and c3["close"] < c1["close"]:
-            zones.append({"index": i, "type": "sell", "price": c3["close"]})
+    for j in np.flatnonzero(buy | sell).tolist():
+        zones.append({"index": j + 2, "type": "buy" if buy[j] else "sell", "price": float(c3[j])})
     return zones
 
 # --- Candle generator (simulate 4H) ---
@@ -42,7 +48,7 @@ def candle_generator():
         close_price = random.uniform(low_price, high_price)
 
         new_candle = {
-            "timestamp": next_4h.strftime("%Y-%m-%d %H:%M:%S"),
+            "epoch": int(next_4h.timestamp()),
             "open": open_price,
             "high": high_price,
             "low": low_price,
@@ -51,8 +57,6 @@ def candle_generator():
 
         last_close = close_price
         datastore["candles"].append(new_candle)
-        if len(datastore["candles"]) > 100:
-            datastore["candles"].pop(0)
 
 @app.route("/")
 def index():
@@ -60,8 +64,11 @@ def index():
 
 @app.route("/data")
 def get_data():
-    candles = datastore["candles"]
-    zones = detect_crt_zones(candles)
+    store = datastore["candles"]
+    candles = store.to_dicts()
+    for candle in candles:
+        candle["timestamp"] = datetime.fromtimestamp(candle.pop("epoch")).strftime("%Y-%m-%d %H:%M:%S")
+    zones = detect_crt_zones(store)
     return jsonify({"candles": candles, "zones": zones})
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+"""
+Speed and accuracy benchmark for the gesture classifier.
+
+    python benchmark.py                      # synthetic fixtures
+    python benchmark.py --cache DIR --labels labels.json
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json   # exit 1 on regression
+
+Labels for a landmark cache are a JSON object {"<frame>": "<gesture>", ...};
+frames without a label are expected to produce no gesture.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from gesture_rules import RuleTable
+from landmark_cache import LandmarkCache
+from landmark_features import LandmarkFeatures
+
+# Finger poses for the synthetic fixtures: (index, middle, ring, pinky) up, thumb direction.
+# "pinch" is a raised thumb whose tip touches the index tip (the tip_dx predicate of ok_sign).
+SYNTHETIC_POSES = {
+    "thumbs_up": ((False, False, False, False), "above"),
+    "thumbs_down": ((False, False, False, False), "below"),
+    "peace": ((True, True, False, False), "below"),
+    "open_palm": ((True, True, True, True), "above"),
+    "rock_on": ((True, False, False, True), "above"),
+    "ok_sign": ((True, False, False, False), "pinch"),
+    None: ((False, True, True, False), "above"),
+}
+
+# Allowed slowdown against the baseline before it counts as a regression
+LATENCY_TOLERANCE = 1.25
+ACCURACY_TOLERANCE = 0.01
+
+
+def synthetic_hand(rng, fingers_up, thumb, jitter=0.01):
+    """One (21, 3) hand with the given finger pose, plus a little noise."""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[0] = (0.5, 0.8, 0.0)
+
+    for f, base in enumerate((5, 9, 13, 17)):
+        x = 0.38 + 0.08 * f
+        up = fingers_up[f]
+        # mcp, pip, dip, tip; a folded finger curls back below its PIP
+        ys = (0.6, 0.5, 0.4, 0.3) if up else (0.6, 0.5, 0.55, 0.6)
+        for j, y in enumerate(ys):
+            points[base + j] = (x, y, 0.0)
+
+    thumb_ys = (0.62, 0.66, 0.7, 0.78) if thumb == "below" else (0.75, 0.68, 0.6, 0.52)
+    for j, y in enumerate(thumb_ys):
+        points[1 + j] = (0.3 - 0.02 * j, y, 0.0)
+
+    points += rng.normal(0, jitter, points.shape).astype(np.float32)
+    if thumb == "pinch":
+        points[4, 0] = points[8, 0] + rng.normal(0, jitter / 2)
+    return points
+
+
+def synthetic_fixtures(per_gesture=500, seed=0):
+    """(points (N, 21, 3), labels [N]) covering every pose in SYNTHETIC_POSES."""
+    rng = np.random.default_rng(seed)
+    points, labels = [], []
+    for gesture, (fingers_up, thumb) in SYNTHETIC_POSES.items():
+        for _ in range(per_gesture):
+            points.append(synthetic_hand(rng, fingers_up, thumb))
+            labels.append(gesture)
+    return np.stack(points), labels
+
+
+def cache_fixtures(path, labels_path):
+    """First hand of every cached frame that has one, labelled from a JSON file."""
+    cache = LandmarkCache(path)
+    with open(labels_path, "r") as f:
+        frame_labels = {int(k): v for k, v in json.load(f).items()}
+
+    keep = cache.index["hands"] > 0
+    points = np.asarray(cache.landmarks[keep, 0])
+    labels = [frame_labels.get(frame) for frame in cache.index["frame"][keep].tolist()]
+    return points, labels
+
+
+def precision_recall(expected, predicted):
+    """Per-gesture precision/recall/support; None (no gesture) is not scored as a class."""
+    report = {}
+    for gesture in sorted({g for g in expected + predicted if g is not None}):
+        tp = sum(1 for e, p in zip(expected, predicted) if e == gesture and p == gesture)
+        fp = sum(1 for e, p in zip(expected, predicted) if e != gesture and p == gesture)
+        fn = sum(1 for e, p in zip(expected, predicted) if e == gesture and p != gesture)
+        report[gesture] = {
+            "precision": tp / (tp + fp) if tp + fp else 0.0,
+            "recall": tp / (tp + fn) if tp + fn else 0.0,
+            "support": tp + fn,
+        }
+    return report
+
+
+def percentile(sorted_samples, p):
+    return sorted_samples[min(len(sorted_samples) - 1, int(p * len(sorted_samples)))]
+
+
+def run(points, labels, rule_table=None, repeat=3):
+    if not len(labels):
+        raise ValueError("no fixtures to benchmark")
+    rule_table = rule_table or RuleTable()
+
+    # per-call path: features + classify for one hand, as in the live loop
+    latencies = []
+    predicted = []
+    for _ in range(repeat):
+        predicted = []
+        for hand in points:
+            start = time.perf_counter()
+            predicted.append(rule_table.classify(LandmarkFeatures(hand)))
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    # batched path: the whole fixture set in one vectorized pass
+    start = time.perf_counter()
+    batch = rule_table.names[rule_table.classify_batch(LandmarkFeatures(points))].tolist()
+    batch_seconds = time.perf_counter() - start
+
+    accuracy = sum(1 for e, p in zip(labels, predicted) if e == p) / len(labels)
+
+    return {
+        "hands": len(labels),
+        "accuracy": accuracy,
+        "per_gesture": precision_recall(labels, predicted),
+        "batch_matches_single": batch == predicted,
+        "single": {
+            "fps": len(latencies) / sum(latencies),
+            "p50_us": percentile(latencies, 0.50) * 1e6,
+            "p95_us": percentile(latencies, 0.95) * 1e6,
+            "p99_us": percentile(latencies, 0.99) * 1e6,
+        },
+        "batch": {
+            "fps": len(labels) / batch_seconds if batch_seconds else float("inf"),
+        },
+    }
+
+
+def regressions(result, baseline):
+    """Human readable list of everything that got worse than the baseline."""
+    problems = []
+
+    if result["accuracy"] < baseline["accuracy"] - ACCURACY_TOLERANCE:
+        problems.append(f"accuracy {result['accuracy']:.3f} < baseline {baseline['accuracy']:.3f}")
+
+    for gesture, base in baseline["per_gesture"].items():
+        now = result["per_gesture"].get(gesture, {"precision": 0.0, "recall": 0.0})
+        for metric in ("precision", "recall"):
+            if now[metric] < base[metric] - ACCURACY_TOLERANCE:
+                problems.append(f"{gesture} {metric} {now[metric]:.3f} < baseline {base[metric]:.3f}")
+
+    for key in ("p50_us", "p95_us"):
+        if result["single"][key] > baseline["single"][key] * LATENCY_TOLERANCE:
+            problems.append(f"{key} {result['single'][key]:.1f} > baseline {baseline['single'][key]:.1f}")
+
+    if not result["batch_matches_single"]:
+        problems.append("classify_batch disagrees with classify")
+
+    return problems
+
+
+def print_report(result):
+    print(f"hands: {result['hands']}  accuracy: {result['accuracy']:.3f}")
+    for gesture, stats in result["per_gesture"].items():
+        print(f"  {gesture:<14} precision {stats['precision']:.3f}  recall {stats['recall']:.3f}  n={stats['support']}")
+    single = result["single"]
+    print(f"single: {single['fps']:.0f} hands/s  p50 {single['p50_us']:.1f}us  "
+          f"p95 {single['p95_us']:.1f}us  p99 {single['p99_us']:.1f}us")
+    print(f"batch:  {result['batch']['fps']:.0f} hands/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cache", help="landmark cache directory to replay instead of synthetic hands")
+    parser.add_argument("--labels", help="JSON frame labels for --cache")
+    parser.add_argument("--rules", help="extra gesture rules JSON (see gesture_rules.py)")
+    parser.add_argument("--baseline", help="fail if results regress against this baseline JSON")
+    parser.add_argument("--save-baseline", help="write the results as a new baseline JSON")
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        if not args.labels:
+            parser.error("--cache needs --labels")
+        points, labels = cache_fixtures(args.cache, args.labels)
+        if not labels:
+            parser.error(f"no frame in {args.cache} has a hand to benchmark")
+    else:
+        points, labels = synthetic_fixtures()
+
+    rule_table = RuleTable.from_json(args.rules) if args.rules else RuleTable()
+    result = run(points, labels, rule_table)
+    print_report(result)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            problems = regressions(result, json.load(f))
+        for problem in problems:
+            print("REGRESSION:", problem)
+        return 1 if problems else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import json
+import math
+import os
+
+
+class TrieNode:
+    __slots__ = ("children", "word", "count", "best_word", "best_count")
+
+    def __init__(self):
+        self.children = {}
+        self.word = None        # set when a vocabulary word ends here
+        self.count = 0
+        self.best_word = None   # most frequent word below this node, for completion
+        self.best_count = 0
+
+
+class Trie:
+    """Prefix trie over a vocabulary, with the best completion cached on every node."""
+
+    def __init__(self, words=()):
+        self.root = TrieNode()
+        for word in words:
+            self.insert(word)
+
+    def insert(self, word, count=1):
+        nodes = [self.root]
+        node = self.root
+        for letter in word:
+            node = node.children.setdefault(letter, TrieNode())
+            nodes.append(node)
+
+        node.word = word
+        node.count += count
+        for n in nodes:
+            if node.count > n.best_count:
+                n.best_word, n.best_count = word, node.count
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        One word per line, optionally followed by a frequency: "hello 120".
+        """
+        trie = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if parts:
+                    trie.insert(parts[0].lower(), int(parts[1]) if len(parts) > 1 else 1)
+        return trie
+
+    def find(self, prefix):
+        node = self.root
+        for letter in prefix:
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
+
+
+class Hypothesis:
+    __slots__ = ("node", "score")
+
+    def __init__(self, node, score):
+        self.node = node
+        self.score = score
+
+
+class SpellingDecoder:
+    """
+    Incremental beam-search decoder from letter gestures to vocabulary words.
+
+    push() takes one stabilized symbol at a time. Every hypothesis in the beam
+    follows the trie with the observed letter, or with any other child at a
+    `substitution_penalty` (a misrecognized letter); hypotheses costing more
+    than `max_cost` are pruned, so the default allows one substitution per
+    word. The beam is capped at
+    `beam_width` and a trie node has at most one child per letter, so each
+    step costs the same no matter how large the vocabulary is.
+
+    A word is emitted on the boundary symbol (the cheapest complete word or
+    completion of an observed prefix, see flush()), or as soon as the best
+    hypothesis reaches a word that no other word extends.
+    """
+
+    BOUNDARY = " "
+
+    def __init__(self, trie, beam_width=8, substitution_penalty=3.0, max_cost=4.5):
+        self.trie = trie
+        self.beam_width = beam_width
+        self.substitution_penalty = substitution_penalty
+        self.max_cost = max_cost
+        self.reset()
+
+    def reset(self):
+        self.beam = [Hypothesis(self.trie.root, 0.0)]
+
+    def push(self, symbol, confidence=1.0):
+        """Feed one symbol; returns a completed word or None."""
+        if symbol == self.BOUNDARY:
+            return self.flush()
+
+        observed_cost = -math.log(max(confidence, 1e-6))
+        candidates = {}
+
+        for hyp in self.beam:
+            for letter, child in hyp.node.children.items():
+                cost = observed_cost if letter == symbol else self.substitution_penalty
+                score = hyp.score + cost
+                if score > self.max_cost:
+                    continue
+                best = candidates.get(id(child))
+                if best is None or score < best.score:
+                    candidates[id(child)] = Hypothesis(child, score)
+
+        if not candidates:
+            # nothing in the vocabulary continues any hypothesis: drop the symbol
+            return None
+
+        self.beam = sorted(candidates.values(), key=lambda h: h.score)[:self.beam_width]
+
+        best = self.beam[0]
+        if best.node.word and not best.node.children:
+            return self.flush()
+        return None
+
+    def flush(self):
+        """
+        End the current word and return the cheapest candidate, or None.
+
+        Complete words and the best completion of each prefix compete on
+        score - log(frequency). Only observed prefixes (no substitution) are
+        completed, so a guessed prefix cannot expand into an unrelated word.
+        """
+        best, word = None, None
+        for h in self.beam:
+            node = h.node
+            candidates = []
+            if node.word:
+                candidates.append((h.score - math.log(node.count), node.word))
+            if node is not self.trie.root and node.best_word and h.score < self.substitution_penalty:
+                candidates.append((h.score - math.log(node.best_count), node.best_word))
+            for cost, candidate in candidates:
+                if best is None or cost < best:
+                    best, word = cost, candidate
+
+        self.reset()
+        return word
+
+
+class Fingerspeller:
+    """
+    Maps stabilized gestures to letters and feeds them to a SpellingDecoder.
+
+    Configured from JSON:
+        {"vocabulary": "words.txt",
+         "symbols": {"fist": "a", "peace": "v", ...},
+         "boundary": "open_palm"}
+    A relative vocabulary path is resolved against the config file.
+    """
+
+    def __init__(self, decoder, symbols, boundary=None):
+        self.decoder = decoder
+        self.symbols = symbols
+        self.boundary = boundary
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, "r") as f:
+            config = json.load(f)
+
+        vocabulary = os.path.join(os.path.dirname(os.path.abspath(path)), config["vocabulary"])
+        return cls(SpellingDecoder(Trie.from_file(vocabulary)), config["symbols"], config.get("boundary"))
+
+    def handles(self, gesture):
+        return gesture == self.boundary or gesture in self.symbols
+
+    def push(self, gesture, confidence=1.0):
+        """Returns a completed word or None; gestures without a letter are ignored."""
+        if gesture == self.boundary:
+            return self.decoder.push(SpellingDecoder.BOUNDARY)
+        letter = self.symbols.get(gesture)
+        if letter is None:
+            return None
+        return self.decoder.push(letter, confidence)
@@ -0,0 +1,188 @@
+import json
+import operator
+
+import numpy as np
+
+from landmark_features import FINGER_NAMES, STATE_BITS
+
+# Default rules, in priority order. Same schema as a JSON rules file:
+#   name     gesture key (see gesture_dict)
+#   fingers  required up (true) / down (false) state for index..pinky; omitted = don't care
+#   thumb    "above" / "below" its IP joint; omitted = don't care
+#   where    optional distance predicates between finger tips
+#   phrase   optional text to speak, for gestures that are not in gesture_dict yet
+DEFAULT_RULES = [
+    {"name": "thumbs_up", "thumb": "above",
+     "fingers": {"index": False, "middle": False, "ring": False, "pinky": False}},
+    {"name": "thumbs_down", "thumb": "below",
+     "fingers": {"index": False, "middle": False, "ring": False, "pinky": False}},
+    {"name": "peace",
+     "fingers": {"index": True, "middle": True, "ring": False, "pinky": False}},
+    {"name": "fist", "thumb": "below",
+     "fingers": {"index": False, "middle": False, "ring": False, "pinky": False}},
+    {"name": "open_palm",
+     "fingers": {"index": True, "middle": True, "ring": True, "pinky": True}},
+    {"name": "ok_sign",
+     "fingers": {"middle": False, "ring": False, "pinky": False},
+     "where": [{"measure": "tip_dx", "a": "thumb", "b": "index", "op": "<", "value": 0.02}]},
+    {"name": "high_five",
+     "fingers": {"index": True, "middle": True, "ring": True, "pinky": True},
+     "where": [{"measure": "tip_dx", "a": "index", "b": "pinky", "op": ">", "value": 0.1}]},
+    {"name": "rock_on",
+     "fingers": {"index": True, "middle": False, "ring": False, "pinky": True}},
+]
+
+MEASURES = ("tip_dx", "tip_distances")
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+THUMB_STATES = ("above", "below")
+
+
+class GestureRule:
+    """
+    One compiled rule: a bitmask test over LandmarkFeatures.state plus predicates.
+    """
+
+    __slots__ = ("name", "mask", "value", "predicates", "phrase")
+
+    def __init__(self, name, mask, value, predicates=(), phrase=None):
+        self.name = name
+        self.mask = mask
+        self.value = value
+        self.predicates = tuple(predicates)
+        self.phrase = phrase
+
+    def matches_state(self, state):
+        return state & self.mask == self.value
+
+    def check(self, features):
+        for measure, a, b, op, threshold in self.predicates:
+            if not op(getattr(features, measure)[..., a, b], threshold):
+                return False
+        return True
+
+    def __repr__(self):
+        return f"GestureRule({self.name!r}, mask={self.mask:#04x}, value={self.value:#04x})"
+
+
+def compile_rule(spec):
+    """
+    Turn one rule dict (DEFAULT_RULES / JSON schema) into a GestureRule.
+    """
+    name = spec.get("name")
+    if not name:
+        raise ValueError(f"Gesture rule without a name: {spec!r}")
+
+    mask = value = 0
+
+    for finger, up in spec.get("fingers", {}).items():
+        if finger not in STATE_BITS[:4]:
+            raise ValueError(f"Rule {name!r}: unknown finger {finger!r}")
+        bit = 1 << STATE_BITS.index(finger)
+        mask |= bit
+        if up:
+            value |= bit
+
+    thumb = spec.get("thumb")
+    if thumb is not None:
+        if thumb not in THUMB_STATES:
+            raise ValueError(f"Rule {name!r}: thumb must be one of {THUMB_STATES}, got {thumb!r}")
+        above = 1 << STATE_BITS.index("thumb_above")
+        below = 1 << STATE_BITS.index("thumb_below")
+        mask |= above | below
+        value |= above if thumb == "above" else below
+
+    predicates = []
+    for pred in spec.get("where", ()):
+        measure = pred.get("measure")
+        if measure not in MEASURES:
+            raise ValueError(f"Rule {name!r}: measure must be one of {MEASURES}, got {measure!r}")
+        if pred.get("op") not in OPERATORS:
+            raise ValueError(f"Rule {name!r}: op must be one of {tuple(OPERATORS)}, got {pred.get('op')!r}")
+        try:
+            a = FINGER_NAMES.index(pred["a"])
+            b = FINGER_NAMES.index(pred["b"])
+        except (KeyError, ValueError):
+            raise ValueError(f"Rule {name!r}: predicate tips must be in {FINGER_NAMES}: {pred!r}")
+        predicates.append((measure, a, b, OPERATORS[pred["op"]], float(pred["value"])))
+
+    return GestureRule(name, mask, value, predicates, spec.get("phrase"))
+
+
+class RuleTable:
+    """
+    Gesture rules compiled into a lookup table indexed by LandmarkFeatures.state.
+
+    Every possible finger state maps to the (priority ordered) rules that can
+    match it. The list is cut after the first rule without predicates, so most
+    states resolve with a single lookup no matter how many rules exist.
+    """
+
+    def __init__(self, specs=DEFAULT_RULES):
+        self.rules = [compile_rule(spec) for spec in specs]
+        self.table = []
+
+        for state in range(1 << len(STATE_BITS)):
+            candidates = []
+            for rule in self.rules:
+                if not rule.matches_state(state):
+                    continue
+                candidates.append(rule)
+                if not rule.predicates:
+                    break
+            self.table.append(tuple(candidates))
+
+    @classmethod
+    def from_json(cls, path, include_defaults=True):
+        """
+        Load rules from a JSON file: either a list of rules or {"rules": [...]}.
+        File rules take priority over the defaults when include_defaults is set.
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        specs = data["rules"] if isinstance(data, dict) else data
+        if include_defaults:
+            specs = list(specs) + DEFAULT_RULES
+        return cls(specs)
+
+    @property
+    def phrases(self):
+        return {rule.name: rule.phrase for rule in self.rules if rule.phrase}
+
+    def classify(self, features):
+        for rule in self.table[int(features.state)]:
+            if not rule.predicates or rule.check(features):
+                return rule.name
+        return None
+
+    def classify_batch(self, features):
+        """
+        Vectorized classify over LandmarkFeatures built from a batch of hands.
+
+        Returns rule indices with the batch shape, -1 where nothing matched;
+        index `names` with the result to get gesture names.
+        """
+        state = features.state
+        result = np.full(state.shape, -1, dtype=np.int16)
+        pending = np.ones(state.shape, dtype=bool)
+
+        for i, rule in enumerate(self.rules):
+            hit = pending & (state & rule.mask == rule.value)
+            for measure, a, b, op, threshold in rule.predicates:
+                hit &= op(getattr(features, measure)[..., a, b], threshold)
+            result[hit] = i
+            pending &= ~hit
+
+        return result
+
+    @property
+    def names(self):
+        """Gesture names by rule index; the trailing None makes index -1 mean 'no gesture'."""
+        return np.array([rule.name for rule in self.rules] + [None], dtype=object)
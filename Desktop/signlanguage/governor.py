@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import deque
+
+# Quality ladder, best first: (scale of the image fed to hands.process, process every n-th frame)
+DEFAULT_LEVELS = (
+    (1.0, 1),
+    (0.75, 1),
+    (0.5, 1),
+    (0.5, 2),
+    (0.375, 2),
+    (0.375, 3),
+)
+
+
+class QualityGovernor:
+    """
+    Keeps the recognizer loop inside a latency budget on any hardware.
+
+    observe() is fed end-to-end loop latencies. Once per `interval` seconds
+    the p-th percentile of that interval's samples is compared with `target`: over budget
+    (or CPU above `max_cpu`) steps down the quality ladder, i.e. a smaller
+    image for MediaPipe and/or skipped frames; well under budget
+    (below `headroom` × target) with spare CPU steps back up.
+
+    `cpu` is the process CPU time over wall time divided by `cores`, the
+    number of cores the loop is meant to use. Dividing by every core on the
+    machine would hide a saturated loop: one busy core reads 0.25 on a
+    4-core kiosk and never reaches `max_cpu`.
+
+    :param target: latency budget in seconds, e.g. 0.080 for "p95 < 80 ms"
+    :param resize: callable(image, scale) -> image, e.g. a cv2.resize wrapper
+    :param cores: CPU budget in cores, 1 for a loop bound by one inference thread
+    """
+
+    def __init__(self, target, resize, percentile=0.95, levels=DEFAULT_LEVELS,
+                 interval=1.0, headroom=0.6, max_cpu=0.9, window=90, cores=1):
+        self.target = target
+        self.resize = resize
+        self.percentile = percentile
+        self.levels = levels
+        self.interval = interval
+        self.headroom = headroom
+        self.max_cpu = max_cpu
+        self.cores = cores
+
+        self.level = 0
+        self.skipped = 0
+        self.cpu = 0.0
+        self._arrivals = 0
+
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._last_cpu = time.process_time()
+
+    @property
+    def scale(self):
+        return self.levels[self.level][0]
+
+    @property
+    def stride(self):
+        return self.levels[self.level][1]
+
+    def admit(self):
+        """False for frames the current level skips."""
+        # counts arrivals rather than capture indexes: the queues already drop
+        # frames, and a stride over indexes could then starve inference
+        self._arrivals += 1
+        if self._arrivals % self.stride:
+            self.skipped += 1
+            return False
+        return True
+
+    def prepare(self, image):
+        """Downscale the image for inference; landmarks are normalized, so callers need no remapping."""
+        scale = self.scale
+        return image if scale == 1.0 else self.resize(image, scale)
+
+    def observe(self, latency):
+        with self._lock:
+            self._samples.append(latency)
+
+        now = time.monotonic()
+        if now - self._last_check >= self.interval:
+            self._adjust(now)
+
+    def latency(self):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(self.percentile * len(samples)))]
+
+    def _adjust(self, now):
+        cpu_time = time.process_time()
+        self.cpu = (cpu_time - self._last_cpu) / ((now - self._last_check) * self.cores)
+        self._last_cpu = cpu_time
+        self._last_check = now
+
+        latency = self.latency()
+        # every interval is judged on its own samples, so a level change is
+        # never blamed on latencies measured at the previous level
+        with self._lock:
+            self._samples.clear()
+
+        if latency > self.target or self.cpu > self.max_cpu:
+            self.level = min(self.level + 1, len(self.levels) - 1)
+        elif latency < self.target * self.headroom and self.cpu < self.max_cpu * self.headroom:
+            self.level = max(self.level - 1, 0)
@@ -0,0 +1,116 @@
+import json
+import os
+
+import numpy as np
+
+from landmark_features import NUM_LANDMARKS, LandmarkFeatures
+
+# A cache is a directory holding:
+#   landmarks.f32  raw float32, frames × max_hands × 21 × 3, NaN for absent hands
+#   index.npy      one INDEX_DTYPE record per frame
+#   meta.json      fps, max_hands, source video
+LANDMARKS_FILE = "landmarks.f32"
+INDEX_FILE = "index.npy"
+META_FILE = "meta.json"
+
+INDEX_DTYPE = np.dtype([("frame", "<i8"), ("time", "<f8"), ("hands", "<u1")])
+
+
+class LandmarkCacheWriter:
+    """
+    Appends per-frame hand landmarks to a cache directory.
+
+    Landmarks are streamed straight to disk; the frame index is written on close().
+    """
+
+    def __init__(self, path, fps, max_hands=2, source=None):
+        self.path = path
+        self.fps = fps
+        self.max_hands = max_hands
+        self.source = source
+
+        os.makedirs(path, exist_ok=True)
+        self._landmarks = open(os.path.join(path, LANDMARKS_FILE), "wb")
+        self._index = []
+        self._empty = np.full((max_hands, NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+
+    def append(self, frame, points):
+        """
+        :param frame: frame number in the source video
+        :param points: (hands, 21, 3) array, or None when no hand was found
+        """
+        block = self._empty.copy()
+        hands = 0
+        if points is not None and len(points):
+            hands = min(len(points), self.max_hands)
+            block[:hands] = points[:hands]
+
+        self._landmarks.write(block.tobytes())
+        self._index.append((frame, frame / self.fps, hands))
+
+    def close(self):
+        self._landmarks.close()
+        np.save(os.path.join(self.path, INDEX_FILE), np.array(self._index, dtype=INDEX_DTYPE))
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump({"fps": self.fps, "max_hands": self.max_hands, "source": self.source}, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LandmarkCache:
+    """
+    Read side of a cache: `landmarks` is a read-only memmap, `index` the frame records.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(os.path.join(path, META_FILE), "r") as f:
+            meta = json.load(f)
+        self.fps = meta["fps"]
+        self.max_hands = meta["max_hands"]
+        self.source = meta.get("source")
+
+        self.index = np.load(os.path.join(path, INDEX_FILE))
+        shape = (len(self.index), self.max_hands, NUM_LANDMARKS, 3)
+        if len(self.index):
+            self.landmarks = np.memmap(os.path.join(path, LANDMARKS_FILE), dtype=np.float32, mode="r", shape=shape)
+        else:
+            self.landmarks = np.empty(shape, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.index)
+
+    def classify(self, classifier, chunk_frames=100_000):
+        """
+        Re-run a classifier (RuleTable or GestureClassifier) over every cached
+        frame without touching MediaPipe.
+
+        Returns an int16 array (frames × max_hands) of indices into
+        `classifier.names`, -1 where no gesture matched or no hand was
+        present. Frames are processed in chunks so memory stays bounded on
+        large corpora.
+        """
+        labels = np.full((len(self), self.max_hands), -1, dtype=np.int16)
+        present = np.arange(self.max_hands) < self.index["hands"][:, None]
+
+        for start in range(0, len(self), chunk_frames):
+            stop = start + chunk_frames
+            features = LandmarkFeatures(np.asarray(self.landmarks[start:stop]))
+            labels[start:stop] = classifier.classify_batch(features)
+
+        labels[~present] = -1
+        return labels
+
+    def frame_gestures(self, classifier):
+        """Yield (frame, [gesture, ...]) like transcribe.classify_video, from the cache."""
+        labels = self.classify(classifier)
+        names = classifier.names
+        hands = self.index["hands"]
+
+        for frame, row, count in zip(self.index["frame"].tolist(), names[labels], hands.tolist()):
+            yield frame, list(row[:count])
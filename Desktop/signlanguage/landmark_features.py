@@ -0,0 +1,125 @@
+import numpy as np
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_TIP = 16
+PINKY_TIP = 20
+
+NUM_LANDMARKS = 21
+
+# Tips in thumb → pinky order, and the PIP joint each finger tip is compared against
+FINGER_NAMES = ("thumb", "index", "middle", "ring", "pinky")
+FINGER_TIPS = np.array([THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+FINGER_PIPS = FINGER_TIPS[1:] - 2
+
+# Wrist → tip chain for every finger, used for the joint angles
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],
+    [0, 5, 6, 7, 8],
+    [0, 9, 10, 11, 12],
+    [0, 13, 14, 15, 16],
+    [0, 17, 18, 19, 20],
+])
+
+# Bit layout of LandmarkFeatures.state: one bit per up finger, then the thumb direction
+STATE_BITS = ("index", "middle", "ring", "pinky", "thumb_above", "thumb_below")
+STATE_WEIGHTS = 1 << np.arange(len(STATE_BITS))
+STATE_TIPS = np.append(FINGER_TIPS[1:], [THUMB_TIP, THUMB_IP])
+STATE_REFS = np.append(FINGER_PIPS, [THUMB_IP, THUMB_TIP])
+
+
+def landmarks_to_array(landmarks):
+    """
+    Convert MediaPipe hand landmarks into a (21, 3) float32 array.
+
+    Accepts a NormalizedLandmarkList, a sequence of landmark objects with
+    x/y/z attributes, a sequence of (x, y, z) tuples or an existing array.
+    """
+    if isinstance(landmarks, np.ndarray):
+        return np.asarray(landmarks, dtype=np.float32)
+
+    points = getattr(landmarks, "landmark", landmarks)
+
+    if len(points) and hasattr(points[0], "x"):
+        # one flat list converts faster than a list of tuples
+        return np.array([v for p in points for v in (p.x, p.y, p.z)], dtype=np.float32).reshape(-1, 3)
+
+    return np.array(points, dtype=np.float32)
+
+
+class LandmarkFeatures:
+    """
+    Every per-hand feature the gesture rules need, computed with vectorized ops.
+
+    `points` may be a single hand (21, 3) or any batch of hands (..., 21, 3);
+    all features keep the leading batch dimensions. `state` and `tip_dx`,
+    which the default rules read, are computed up front; `tip_distances` and
+    `joint_angles` on first access, so a single live hand only pays for what
+    its rules use.
+    """
+
+    __slots__ = (
+        "points",
+        "fingers_up",
+        "thumb_above_ip",
+        "thumb_below_ip",
+        "state",
+        "tip_dx",
+        "_tip_distances",
+        "_joint_angles",
+    )
+
+    def __init__(self, points):
+        self.points = points
+        y = points[..., 1]
+
+        # one comparison per STATE_BITS entry (image y grows downward):
+        # index..pinky tip above its PIP joint, thumb tip above / below its IP joint
+        flags = y[..., STATE_TIPS] < y[..., STATE_REFS]
+        self.fingers_up = flags[..., :4]
+        self.thumb_above_ip = flags[..., 4]
+        self.thumb_below_ip = flags[..., 5]
+
+        # all of the above packed into a single int for table lookups
+        self.state = flags @ STATE_WEIGHTS
+
+        # pairwise |x| offsets between the finger tips (..., 5, 5)
+        tips_x = points[..., FINGER_TIPS, 0]
+        self.tip_dx = np.abs(tips_x[..., :, None] - tips_x[..., None, :])
+
+        self._tip_distances = None
+        self._joint_angles = None
+
+    @property
+    def tip_distances(self):
+        """Pairwise euclidean distances between the finger tips (..., 5, 5)."""
+        if self._tip_distances is None:
+            tips = self.points[..., FINGER_TIPS, :]
+            offsets = tips[..., :, None, :] - tips[..., None, :, :]
+            self._tip_distances = np.sqrt(np.sum(offsets * offsets, axis=-1))
+        return self._tip_distances
+
+    @property
+    def joint_angles(self):
+        """Bend angle (radians) at the 3 inner joints of every finger (..., 5, 3)."""
+        if self._joint_angles is None:
+            chains = self.points[..., FINGER_CHAINS, :]
+            bones = chains[..., 1:, :] - chains[..., :-1, :]
+            a = bones[..., :-1, :]
+            b = bones[..., 1:, :]
+            dot = np.sum(a * b, axis=-1)
+            norms = np.sqrt(np.sum(a * a, axis=-1) * np.sum(b * b, axis=-1))
+            cos = np.divide(dot, norms, out=np.ones_like(dot), where=norms > 0)
+            self._joint_angles = np.arccos(np.clip(cos, -1.0, 1.0))
+        return self._joint_angles
+
+    @classmethod
+    def from_landmarks(cls, landmarks):
+        return cls(landmarks_to_array(landmarks))
+
+    def point(self, index):
+        return self.points[..., index, :]
@@ -0,0 +1,64 @@
+import importlib
+import threading
+import time
+
+
+class LazyResource:
+    """
+    A heavy object built on first use.
+
+    get() calls `factory` once, under a lock so concurrent callers wait for the
+    same instance instead of building two, and records how long it took.
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self._factory = factory
+        self._value = None
+        self._built = False
+        self._lock = threading.Lock()
+        self.seconds = None
+
+    @property
+    def loaded(self):
+        return self._built
+
+    def get(self):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    start = time.perf_counter()
+                    self._value = self._factory()
+                    self.seconds = time.perf_counter() - start
+                    self._built = True
+        return self._value
+
+
+class LazyModule(LazyResource):
+    """
+    Module proxy that imports on first attribute access, so `cv2.imshow(...)`
+    keeps working while `import sign` stays cheap.
+    """
+
+    def __init__(self, module_name):
+        super().__init__(f"import {module_name}", lambda: importlib.import_module(module_name))
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
+
+
+def warm_up(resources):
+    """Build `resources` in order on a background thread; returns the started thread."""
+
+    def run():
+        for resource in resources:
+            resource.get()
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def startup_report(resources):
+    """{name: milliseconds} for every resource built so far."""
+    return {r.name: r.seconds * 1000 for r in resources if r.loaded}
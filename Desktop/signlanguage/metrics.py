@@ -0,0 +1,69 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def render_metrics(samples):
+    """
+    Prometheus text exposition format for (name, help, labels, value) samples.
+    Samples sharing a name are grouped under one HELP/TYPE header (all gauges).
+    """
+    groups = {}
+    for name, help_text, labels, value in samples:
+        groups.setdefault(name, (help_text, []))[1].append((labels, value))
+
+    lines = []
+    for name, (help_text, series) in groups.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in series:
+            if labels:
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value:g}")
+            else:
+                lines.append(f"{name} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves `collect()` as Prometheus text on http://host:port/metrics from a
+    daemon thread. `collect` returns samples for render_metrics and is called
+    on every scrape, so it should only read counters, never block on the pipeline.
+    """
+
+    def __init__(self, collect, host="127.0.0.1", port=9100):
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        collect = self.collect
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_metrics(collect()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes every few seconds would flood the console
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join(timeout=2)
+            self._server = None
@@ -0,0 +1,234 @@
+import threading
+import time
+from collections import deque
+
+
+class DropOldestQueue:
+    """
+    Bounded queue that never blocks the producer: when full, the oldest item is
+    discarded so consumers always see the most recent frames.
+    """
+
+    def __init__(self, maxsize=2):
+        self._items = deque(maxlen=maxsize)
+        self._not_empty = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._not_empty:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def get(self, timeout=None):
+        """Return the oldest queued item, or None if nothing arrived within timeout."""
+        with self._not_empty:
+            if not self._items:
+                self._not_empty.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class StageStats:
+    """
+    Rolling latency statistics for one pipeline stage (seconds).
+    """
+
+    def __init__(self, name, window=120):
+        self.name = name
+        self.count = 0
+        self.last = 0.0
+        self._samples = deque(maxlen=window)
+        self._times = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.last = seconds
+            self._samples.append(seconds)
+            self._times.append(time.perf_counter())
+
+    def rate(self):
+        """Events per second over the window, e.g. capture fps."""
+        with self._lock:
+            if len(self._times) < 2:
+                return 0.0
+            span = self._times[-1] - self._times[0]
+            return (len(self._times) - 1) / span if span > 0 else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self.count
+
+        if not samples:
+            return {"count": count, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+
+        def pct(p):
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+        return {
+            "count": count,
+            "mean_ms": sum(samples) / len(samples) * 1000,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+        }
+
+
+class Frame:
+    """One captured frame travelling through the pipeline."""
+
+    __slots__ = ("index", "captured_at", "image", "results", "gestures")
+
+    def __init__(self, index, captured_at, image):
+        self.index = index
+        self.captured_at = captured_at
+        self.image = image
+        self.results = None
+        self.gestures = []
+
+
+class RecognitionPipeline:
+    """
+    Three stage capture → inference → render pipeline.
+
+    Capture and inference each run on their own thread and hand frames over
+    through DropOldestQueue, so a slow stage makes the pipeline skip frames
+    instead of falling behind real time. Render runs on the calling thread
+    (OpenCV windows must be driven from the main thread).
+
+    :param capture: object with a cv2.VideoCapture style read() -> (ok, image)
+    :param infer: callable(image) -> (results, gestures), e.g. hands.process + recognize_gesture
+    :param render: callable(frame) -> bool, returns False to stop the pipeline
+    :param governor: optional governor.QualityGovernor; it is fed end-to-end
+                     latencies and decides which frames reach `infer`, and at
+                     what scale. Render always gets the full-size frame.
+    """
+
+    STAGES = ("capture", "inference", "render", "end_to_end")
+
+    def __init__(self, capture, infer, render, queue_size=2, governor=None):
+        self.capture = capture
+        self.infer = infer
+        self.render = render
+        self.governor = governor
+
+        self.captured = DropOldestQueue(queue_size)
+        self.inferred = DropOldestQueue(queue_size)
+        self.stats = {name: StageStats(name) for name in self.STAGES}
+
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._error = None
+
+    def start(self):
+        """Start the capture and inference threads."""
+        self._stop_event.clear()
+        self._error = None
+        self._threads = [
+            threading.Thread(target=self._guard, args=(self._capture_loop,), name="capture", daemon=True),
+            threading.Thread(target=self._guard, args=(self._inference_loop,), name="inference", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop the worker threads."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+    def run(self):
+        """
+        Start the pipeline and drive the render stage until it asks to stop.
+
+        An exception raised in the capture or inference stage stops the
+        pipeline and is re-raised here.
+        """
+        self.start()
+        try:
+            while not self._stop_event.is_set():
+                frame = self.inferred.get(timeout=0.1)
+                if frame is None:
+                    continue
+
+                start = time.perf_counter()
+                keep_going = self.render(frame)
+                now = time.perf_counter()
+                self.stats["render"].record(now - start)
+                self.stats["end_to_end"].record(now - frame.captured_at)
+                if self.governor is not None:
+                    self.governor.observe(now - frame.captured_at)
+
+                if keep_going is False:
+                    break
+        finally:
+            self.stop()
+
+        if self._error is not None:
+            raise self._error
+
+    def _guard(self, loop):
+        """Run a worker loop; on failure record the error and stop the pipeline."""
+        try:
+            loop()
+        except Exception as e:
+            self._error = e
+            self._stop_event.set()
+
+    def _capture_loop(self):
+        index = 0
+        while not self._stop_event.is_set():
+            start = time.perf_counter()
+            ok, image = self.capture.read()
+            now = time.perf_counter()
+
+            if not ok:
+                # end of stream / camera unplugged
+                self._stop_event.set()
+                break
+
+            self.stats["capture"].record(now - start)
+            self.captured.put(Frame(index, now, image))
+            index += 1
+
+    def _inference_loop(self):
+        while not self._stop_event.is_set():
+            frame = self.captured.get(timeout=0.1)
+            if frame is None:
+                continue
+
+            image = frame.image
+            if self.governor is not None:
+                if not self.governor.admit():
+                    continue
+                image = self.governor.prepare(image)
+
+            start = time.perf_counter()
+            frame.results, frame.gestures = self.infer(image)
+            self.stats["inference"].record(time.perf_counter() - start)
+
+            self.inferred.put(frame)
+
+    @property
+    def dropped_frames(self):
+        return self.captured.dropped + self.inferred.dropped
+
+    def report(self):
+        """Per-stage latency snapshot, plus dropped frame count."""
+        report = {name: stats.snapshot() for name, stats in self.stats.items()}
+        report["dropped_frames"] = self.dropped_frames
+        if self.governor is not None:
+            report["governor"] = {
+                "scale": self.governor.scale,
+                "stride": self.governor.stride,
+                "skipped_frames": self.governor.skipped,
+                "cpu": round(self.governor.cpu, 3),
+            }
+        return report
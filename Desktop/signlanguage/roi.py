@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class HandRoiTracker:
+    """
+    Runs hand inference on a crop around the hands instead of the full frame.
+
+    A keyframe runs full-frame detection and anchors the crop window around the
+    hands found. Between keyframes every frame is cropped to that same window,
+    so the tracking graph sees a stable view and MediaPipe's own landmark
+    tracking (which skips palm detection between frames) keeps working.
+
+    A new keyframe happens every `keyframe_interval` frames, when the crop
+    loses the hands, when a hand gets within `edge` of the crop border, or when
+    the handedness score inside the crop falls below `min_tracking_confidence`.
+    Landmarks found in the crop are mapped back to full-frame normalized
+    coordinates, so callers see the same results as a full-frame run.
+
+    :param process: callable(rgb_image) -> MediaPipe results, for the crops; should
+                    be a Hands graph in video mode (static_image_mode=False)
+    :param detect: callable used for full-frame keyframes, default `process`
+    :param margin: extra space around the hand box, as a fraction of its size
+    :param min_size: smallest crop side, as a fraction of the frame side
+    :param edge: hands closer than this (crop-normalized) to the border force a keyframe
+    """
+
+    def __init__(self, process, detect=None, margin=0.5, keyframe_interval=30,
+                 min_tracking_confidence=0.6, min_size=0.3, edge=0.05):
+        self._process = process
+        self._detect = detect or process
+        self.margin = margin
+        self.keyframe_interval = keyframe_interval
+        self.min_tracking_confidence = min_tracking_confidence
+        self.min_size = min_size
+        self.edge = edge
+
+        self.roi = None  # (x0, y0, x1, y1), normalized
+        self._since_keyframe = 0
+
+        self.keyframes = 0
+        self.roi_frames = 0
+
+    def reset(self):
+        self.roi = None
+        self._since_keyframe = 0
+
+    def process(self, rgb):
+        if self.roi is not None and self._since_keyframe < self.keyframe_interval:
+            results = self._process_roi(rgb)
+            if results is not None:
+                self._since_keyframe += 1
+                self.roi_frames += 1
+                return results
+
+        results = self._detect(rgb)
+        self._since_keyframe = 0
+        self.keyframes += 1
+        self._anchor(results)
+        return results
+
+    def _process_roi(self, rgb):
+        """Inference on the crop; None means the crop lost track and a keyframe is needed."""
+        h, w = rgb.shape[:2]
+        x0, y0, x1, y1 = self.roi
+        px0, py0 = int(x0 * w), int(y0 * h)
+        px1, py1 = int(np.ceil(x1 * w)), int(np.ceil(y1 * h))
+        cw, ch = px1 - px0, py1 - py0
+        if cw <= 0 or ch <= 0:
+            return None
+
+        results = self._process(np.ascontiguousarray(rgb[py0:py1, px0:px1]))
+        if not results.multi_hand_landmarks:
+            return None
+
+        if results.multi_handedness:
+            score = min(hand.classification[0].score for hand in results.multi_handedness)
+            if score < self.min_tracking_confidence:
+                return None
+
+        # hand drifting out of the fixed window: re-anchor on the next frame
+        lo, hi = self.edge, 1.0 - self.edge
+        for hand_landmarks in results.multi_hand_landmarks:
+            if any(not (lo < lm.x < hi and lo < lm.y < hi) for lm in hand_landmarks.landmark):
+                self._since_keyframe = self.keyframe_interval
+                break
+
+        # crop-normalized → frame-normalized, in place
+        sx, sy = cw / w, ch / h
+        ox, oy = px0 / w, py0 / h
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx
+
+        return results
+
+    def _anchor(self, results):
+        if not results.multi_hand_landmarks:
+            self.roi = None
+            return
+
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        self.roi = expand_box(min(xs), min(ys), max(xs), max(ys), self.margin, self.min_size)
+
+
+def expand_box(x0, y0, x1, y1, margin, min_size):
+    """Grow a normalized box by margin (and up to min_size), clipped to the frame."""
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    half_w = max((x1 - x0) * (1 + 2 * margin), min_size) / 2
+    half_h = max((y1 - y0) * (1 + 2 * margin), min_size) / 2
+
+    return (
+        max(0.0, cx - half_w),
+        max(0.0, cy - half_h),
+        min(1.0, cx + half_w),
+        min(1.0, cy + half_h),
+    )
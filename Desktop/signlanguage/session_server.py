@@ -0,0 +1,222 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import mediapipe as mp
+
+from gesture_rules import RuleTable
+from landmark_features import LandmarkFeatures
+from stabilizer import GestureStabilizer
+
+
+class Subscription:
+    """
+    Bounded event queue for one subscriber. When the subscriber falls behind
+    the oldest events are dropped, so it can never stall the streams.
+    """
+
+    def __init__(self, maxsize=100):
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class CameraStream:
+    """
+    One camera with its own MediaPipe Hands instance and one stabilizer per hand.
+
+    MediaPipe graphs are not thread safe, so a stream never has more than one
+    frame in flight; streams share the server's worker pool.
+
+    Stabilizers are keyed by hand slot (position in MediaPipe's results), not by
+    handedness label, because MediaPipe often gives both hands the same label.
+    """
+
+    def __init__(self, stream_id, source, classifier, fps_cap=15.0, min_detection_confidence=0.7):
+        self.stream_id = stream_id
+        self.source = source
+        self.classifier = classifier
+        self.fps_cap = fps_cap
+        self.min_detection_confidence = min_detection_confidence
+
+        self.capture = None
+        self.hands = None
+        self.stabilizers = {}
+        self.frames = 0
+        self._next_due = 0.0
+
+    def open(self):
+        self.capture = cv2.VideoCapture(self.source)
+        # keep the driver from queueing stale frames; not every backend honours it
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.hands = mp.solutions.hands.Hands(max_num_hands=2, min_detection_confidence=self.min_detection_confidence)
+
+    def close(self):
+        if self.capture is not None:
+            self.capture.release()
+        if self.hands is not None:
+            self.hands.close()
+
+    def read_latest(self):
+        """
+        Grab frames until the next one is due under fps_cap and decode only that one,
+        so a camera faster than the cap never hands out frames from its buffer.
+        """
+        interval = 1.0 / self.fps_cap if self.fps_cap else 0.0
+
+        if not self.capture.grab():
+            return False, None
+        while time.monotonic() < self._next_due:
+            if not self.capture.grab():
+                return False, None
+
+        self._next_due = max(self._next_due + interval, time.monotonic())
+        return self.capture.retrieve()
+
+    def step(self):
+        """
+        Read and process one frame (runs on a pool thread).
+
+        Returns a list of (hand slot, handedness, gesture) activations, or None
+        at end of stream.
+        """
+        ok, image = self.read_latest()
+        if not ok:
+            return None
+        self.frames += 1
+
+        results = self.hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        seen = set()
+        activations = []
+
+        if results.multi_hand_landmarks:
+            hands = zip(results.multi_hand_landmarks, results.multi_handedness)
+            for slot, (hand_landmarks, handedness) in enumerate(hands):
+                info = handedness.classification[0]
+                seen.add(slot)
+
+                gesture = self.classifier.classify(LandmarkFeatures.from_landmarks(hand_landmarks))
+                wrist = hand_landmarks.landmark[0]
+                stabilizer = self.stabilizers.setdefault(slot, GestureStabilizer())
+                activated = stabilizer.update(gesture, info.score, (wrist.x, wrist.y))
+                if activated:
+                    activations.append((slot, info.label, activated))
+
+        # hands that left the frame still need their window to drain
+        for slot, stabilizer in self.stabilizers.items():
+            if slot not in seen:
+                stabilizer.update(None, 0.0)
+
+        return activations
+
+
+class GestureSessionServer:
+    """
+    Serves gesture events for several camera streams from one process.
+
+    Frames are processed on a shared thread pool; every stream is capped at
+    `fps_cap` frames per second by discarding the frames in between. Events
+    go to asyncio subscribers (subscribe()) and, with serve(), to TCP clients
+    as JSON lines. Each subscriber has its own bounded queue, so a slow client
+    only loses its own oldest events.
+    """
+
+    def __init__(self, sources, phrases=None, classifier=None, max_workers=None,
+                 fps_cap=15.0, subscriber_queue=100):
+        self.phrases = phrases or {}
+        self.classifier = classifier or RuleTable()
+        self.fps_cap = fps_cap
+        self.subscriber_queue = subscriber_queue
+
+        self.streams = [CameraStream(i, source, self.classifier, fps_cap) for i, source in enumerate(sources)]
+        self.executor = ThreadPoolExecutor(max_workers or len(self.streams), thread_name_prefix="stream")
+        self.subscriptions = set()
+        self._tasks = []
+
+    def subscribe(self, maxsize=None):
+        subscription = Subscription(maxsize or self.subscriber_queue)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
+
+    def publish(self, event):
+        for subscription in self.subscriptions:
+            subscription.put(event)
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        for stream in self.streams:
+            await loop.run_in_executor(self.executor, stream.open)
+            self._tasks.append(asyncio.create_task(self._run_stream(stream)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        # every _run_stream closes its own stream once its last step has finished
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.executor.shutdown(wait=False)
+
+    async def _run_stream(self, stream):
+        loop = asyncio.get_running_loop()
+        step = None
+
+        try:
+            while True:
+                step = loop.run_in_executor(self.executor, stream.step)
+                activations = await step
+                if activations is None:
+                    self.publish({"stream": stream.stream_id, "event": "end"})
+                    return
+
+                for slot, handedness, gesture in activations:
+                    self.publish({
+                        "stream": stream.stream_id,
+                        "event": "gesture",
+                        "hand": slot,
+                        "handedness": handedness,
+                        "gesture": gesture,
+                        "phrase": self.phrases.get(gesture, gesture),
+                        "time": time.time(),
+                    })
+        finally:
+            # cancelling the task does not stop a step already running on the
+            # pool, so let it finish before releasing the camera and graph
+            if step is not None and not step.done():
+                await asyncio.wait([step])
+            await loop.run_in_executor(self.executor, stream.close)
+
+    async def _handle_client(self, reader, writer):
+        subscription = self.subscribe()
+        try:
+            while True:
+                event = await subscription.get()
+                writer.write(json.dumps(event).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.unsubscribe(subscription)
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        """Run the streams and publish events to TCP clients until cancelled."""
+        server = await asyncio.start_server(self._handle_client, host, port)
+        await self.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
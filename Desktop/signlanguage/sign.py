@@ -1,14 +1,67 @@
-import cv2
-import mediapipe as mp
-import pyttsx3
+import argparse
+import json
+import os
+import socket
+import sys
+import time
 
-# Initialize Mediapipe Hand Tracking
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-hands = mp_hands.Hands(min_detection_confidence=0.7)
+import numpy as np
 
-# Initialize Text-to-Speech
-engine = pyttsx3.init()
+from fingerspelling import Fingerspeller
+from gesture_rules import RuleTable
+from governor import QualityGovernor
+from landmark_features import LandmarkFeatures
+from lazy import LazyModule, LazyResource, startup_report, warm_up
+from metrics import MetricsServer
+from pipeline import RecognitionPipeline, StageStats
+from roi import HandRoiTracker
+from stabilizer import GestureStabilizer, detect_wave
+from template_classifier import GestureClassifier, TemplateClassifier
+from tts import SpeechWorker
+
+# Heavy dependencies are imported on first use, so `from sign import recognize_gesture`
+# (tests, batch tools, spawned workers) stays cheap
+cv2 = LazyModule("cv2")
+mp = LazyModule("mediapipe")
+pyttsx3 = LazyModule("pyttsx3")
+
+# SIGN_ROI_TRACKING=1 crops frames to a window around the hands between keyframes.
+# The crop window only moves on keyframes, so `hands` keeps MediaPipe's own
+# tracking; keyframes use a separate static-mode graph for full-frame detection.
+ROI_TRACKING = os.environ.get("SIGN_ROI_TRACKING") == "1"
+
+# SIGN_LATENCY_TARGET_MS (e.g. 80) enables the quality governor: when the p95
+# end-to-end latency goes over the target, frames are downscaled before
+# MediaPipe and then skipped, and quality comes back once there is headroom.
+LATENCY_TARGET_MS = float(os.environ.get("SIGN_LATENCY_TARGET_MS", "0"))
+
+
+def _build_hands():
+    hands = mp.solutions.hands.Hands(min_detection_confidence=0.7)
+    # the first process() call initializes the graph; pay for it here, not on the first real frame
+    hands.process(np.zeros((240, 320, 3), dtype=np.uint8))
+    return hands
+
+
+def _build_roi_tracker():
+    keyframe_hands = mp.solutions.hands.Hands(static_image_mode=True, min_detection_confidence=0.7)
+    return HandRoiTracker(hands.get().process, detect=keyframe_hands.process)
+
+
+# Hand graphs are built on first use (or by the live loop's warm-up): batch workers
+# and the other subcommands never pay for them.
+hands = LazyResource("hands graph", _build_hands)
+roi_tracker = LazyResource("roi tracker", _build_roi_tracker) if ROI_TRACKING else None
+
+# Initialize Text-to-Speech (engine is created on the worker thread)
+TTS_COOLDOWN = float(os.environ.get("SIGN_TTS_COOLDOWN", "2.0"))
+tts_engine = LazyResource("tts engine", lambda: pyttsx3.init())
+speech = SpeechWorker(tts_engine.get, cooldown=TTS_COOLDOWN)
+
+# Timings inside the inference and render stages, for --overlay and --metrics-port
+mediapipe_stats = StageStats("mediapipe")
+classify_stats = StageStats("classification")
+draw_stats = StageStats("draw")
 
 # Define Gesture Dictionary (30+ Gestures)
 gesture_dict = {
@@ -47,48 +100,286 @@ gesture_dict = {
     "hands_shrug": "I don't know",
 }
 
+# Compiled gesture rules; SIGN_GESTURE_RULES may point at a JSON file of extra rules
+GESTURE_RULES_FILE = os.environ.get("SIGN_GESTURE_RULES")
+rule_table = RuleTable.from_json(GESTURE_RULES_FILE) if GESTURE_RULES_FILE else RuleTable()
+
+for gesture, phrase in rule_table.phrases.items():
+    gesture_dict.setdefault(gesture, phrase)
+
+# SIGN_TEMPLATES may point at labelled landmark templates (.npz, see `sign.py templates`);
+# they recognize the gestures no rule covers, e.g. heart_sign or call_me
+TEMPLATES_FILE = os.environ.get("SIGN_TEMPLATES")
+template_classifier = TemplateClassifier.load(TEMPLATES_FILE) if TEMPLATES_FILE else None
+
+# the one classification path shared by the live loop, `serve`, `transcribe` and `reclassify`
+gesture_classifier = GestureClassifier(rule_table, template_classifier)
+
+# SIGN_SPELLING may point at a fingerspelling config (see fingerspelling.Fingerspeller);
+# letter gestures are then decoded into whole words before they are spoken
+SPELLING_FILE = os.environ.get("SIGN_SPELLING")
+speller = Fingerspeller.from_json(SPELLING_FILE) if SPELLING_FILE else None
+
 
 def recognize_gesture(landmarks):
     """
     Recognize different hand gestures based on finger positions.
+
+    `landmarks` can be raw MediaPipe landmarks or precomputed LandmarkFeatures.
     """
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-
-    # Check if fingers are up or down
-    fingers_up = [landmarks[i][1] < landmarks[i - 2][1] for i in [8, 12, 16, 20]]
-
-    # Thumbs Up
-    if landmarks[4][1] < landmarks[3][1] and all(not f for f in fingers_up):
-        return "thumbs_up"
-    
-    # Thumbs Down
-    if landmarks[4][1] > landmarks[3][1] and all(not f for f in fingers_up):
-        return "thumbs_down"
-
-    # Peace Sign (Index & Middle Finger Up)
-    if fingers_up[0] and fingers_up[1] and not fingers_up[2] and not fingers_up[3]:
-        return "peace"
-
-    # Fist (All Fingers Bent)
-    if all(not f for f in fingers_up) and thumb_tip[1] > landmarks[3][1]:
-        return "fist"
-
-    # Open Palm (All Fingers Extended)
-    if all(f for f in fingers_up):
-        return "open_palm"
-
-    # OK Sign (Thumb & Index Finger Touching)
-    if abs(thumb_tip[0] - index_tip[0]) < 0.02 and not any(fingers_up[1:]):
-        return "ok_sign"
-
-    # High Five (All Fingers Spread Out)
-    if all(fingers_up) and abs(index_tip[0] - pinky_tip[0]) > 0.1:
-        return "high_five"
-
-    # "Rock On" Gesture (Index & Pinky Up)
-    if fingers_up[0] and not fingers_up[1] and not fingers_up[2] and fingers_up[3]:
-        return "rock_on"
+    if not isinstance(landmarks, LandmarkFeatures):
+        landmarks = LandmarkFeatures.from_landmarks(landmarks)
+
+    return gesture_classifier.classify(landmarks)
+
+
+def infer(image):
+    """
+    Inference stage: run MediaPipe on a BGR frame and classify every detected hand.
+    """
+    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    start = time.perf_counter()
+    results = roi_tracker.get().process(rgb) if roi_tracker else hands.get().process(rgb)
+    mediapipe_stats.record(time.perf_counter() - start)
+
+    gestures = []
+    if results.multi_hand_landmarks:
+        for hand_landmarks in results.multi_hand_landmarks:
+            start = time.perf_counter()
+            gestures.append(recognize_gesture(hand_landmarks))
+            classify_stats.record(time.perf_counter() - start)
+
+    return results, gestures
+
+
+def resize(image, scale):
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def collect_metrics(pipeline):
+    """Samples for metrics.render_metrics: pipeline stages, sub-stage timings, TTS and drops."""
+    samples = [
+        ("sign_capture_fps", "Frames captured per second", {}, pipeline.stats["capture"].rate()),
+        ("sign_tts_queue_depth", "Phrases waiting for the speech engine", {}, speech.queue_depth),
+        ("sign_dropped_frames", "Frames dropped by the pipeline queues", {}, pipeline.dropped_frames),
+    ]
+    if pipeline.governor is not None:
+        samples.append(("sign_skipped_frames", "Frames skipped by the quality governor", {},
+                        pipeline.governor.skipped))
+
+    for stats in list(pipeline.stats.values()) + [mediapipe_stats, classify_stats, draw_stats]:
+        snapshot = stats.snapshot()
+        for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms")):
+            samples.append(("sign_stage_latency_seconds", "Per-stage latency over the recent window",
+                            {"stage": stats.name, "quantile": quantile}, snapshot[key] / 1000))
+    return samples
+
+
+def draw_overlay(image, pipeline):
+    lines = (
+        f"capture {pipeline.stats['capture'].rate():.0f} fps",
+        f"mediapipe {mediapipe_stats.snapshot()['p50_ms']:.1f} ms",
+        f"classify {classify_stats.snapshot()['p50_ms'] * 1000:.0f} us",
+        f"draw {draw_stats.snapshot()['p50_ms']:.1f} ms",
+        f"tts queue {speech.queue_depth}",
+        f"dropped {pipeline.dropped_frames}",
+    )
+    y = image.shape[0] - 10 - 18 * (len(lines) - 1)
+    for line in lines:
+        cv2.putText(image, line, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+        y += 18
+
+
+def open_event_sink(target):
+    """Line-oriented sink for JSON gesture events: stdout for "-", else a TCP "host:port"."""
+    if target == "-":
+        return sys.stdout
+    host, port = target.rsplit(":", 1)
+    return socket.create_connection((host, int(port))).makefile("w", encoding="utf-8")
+
+
+def speak(text):
+    """Queue text on the speech worker; never blocks the recognition loop."""
+    return speech.say(text)
+
+
+def main(camera=0, overlay=False, metrics_port=None, headless=False, events=None):
+    """
+    Live recognition from a webcam.
+
+    headless: no window and no landmark drawing; gesture events are written
+    as JSON lines to `events` (stdout by default) and diagnostics go to stderr.
+    """
+    if headless and events is None:
+        events = "-"
+    info = sys.stderr if headless else sys.stdout
+
+    # MediaPipe and the graphs warm up in the background while the camera opens
+    startup = [mp, hands] + ([roi_tracker] if roi_tracker else []) + [pyttsx3]
+    warmup = warm_up(startup)
+    cv2.get()
+    capture = LazyResource("camera", lambda: cv2.VideoCapture(camera))
+    cap = capture.get()
+    if not headless:
+        mp_hands = mp.solutions.hands
+        mp_draw = mp.solutions.drawing_utils
+    sink = open_event_sink(events) if events else None
+
+    stabilizer = GestureStabilizer(window=12)
+    stabilizer.add_motion_detector(detect_wave)
+
+    def emit(event):
+        sink.write(json.dumps(event) + "\n")
+        sink.flush()
+
+    def render(frame):
+        image = frame.image
+        results = frame.results
+
+        label, confidence, wrist = None, 0.0, None
+        if results.multi_hand_landmarks:
+            if not headless:
+                start = time.perf_counter()
+                for hand_landmarks in results.multi_hand_landmarks:
+                    mp_draw.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+                draw_stats.record(time.perf_counter() - start)
+
+            # the first hand with a recognized gesture drives the output
+            for i, gesture in enumerate(frame.gestures):
+                if gesture:
+                    wrist_landmark = results.multi_hand_landmarks[i].landmark[0]
+                    label = gesture
+                    confidence = results.multi_handedness[i].classification[0].score
+                    wrist = (wrist_landmark.x, wrist_landmark.y)
+                    break
+
+        activated = stabilizer.update(label, confidence, wrist)
+        if activated:
+            if speller is not None and speller.handles(activated):
+                word = speller.push(activated, confidence)
+                if word:
+                    speak(word)
+                    if sink:
+                        emit({"event": "word", "word": word, "time": time.time()})
+            else:
+                phrase = gesture_dict.get(activated, activated)
+                speak(phrase)
+                if sink:
+                    emit({"event": "gesture", "gesture": activated, "phrase": phrase,
+                          "confidence": confidence, "time": time.time()})
+
+        if headless:
+            return True
+
+        if stabilizer.current:
+            phrase = gesture_dict.get(stabilizer.current, stabilizer.current)
+            cv2.putText(image, phrase, (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 2)
+
+        if overlay:
+            draw_overlay(image, pipeline)
+
+        cv2.imshow("Sign Language Convertor", image)
+        return cv2.waitKey(1) & 0xFF != ord("q")
+
+    speech.start()
+    warmup.join()
+    for component, ms in startup_report([cv2, capture] + startup + [tts_engine]).items():
+        print(f"startup {component}: {ms:.0f} ms", file=info)
+
+    governor = QualityGovernor(LATENCY_TARGET_MS / 1000, resize) if LATENCY_TARGET_MS > 0 else None
+    pipeline = RecognitionPipeline(cap, infer, render, governor=governor)
+    metrics = MetricsServer(lambda: collect_metrics(pipeline), port=metrics_port) if metrics_port else None
+    if metrics:
+        metrics.start()
+    try:
+        pipeline.run()
+    except KeyboardInterrupt:
+        # the only way to stop a headless session
+        pass
+    finally:
+        if metrics:
+            metrics.stop()
+        cap.release()
+        if not headless:
+            cv2.destroyAllWindows()
+        speech.stop()
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+
+    for stage, stats in pipeline.report().items():
+        print(f"{stage}: {stats}", file=info)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sign language to speech convertor")
+    commands = parser.add_subparsers(dest="command")
+
+    live = commands.add_parser("live", help="recognize gestures from a webcam (default)")
+    live.add_argument("--camera", type=int, default=0)
+    live.add_argument("--overlay", action="store_true", help="draw per-stage timings on the video")
+    live.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    live.add_argument("--headless", action="store_true", help="no window or drawing; print gesture events as JSON")
+    live.add_argument("--events", help='write JSON gesture events to "-" (stdout) or a TCP "host:port"')
+
+    batch = commands.add_parser("transcribe", help="write a timestamped transcript of a recorded video")
+    batch.add_argument("video")
+    batch.add_argument("-o", "--output", help="transcript file (default: stdout)")
+    batch.add_argument("-j", "--workers", type=int, help="worker processes (default: CPU count)")
+    batch.add_argument("--cache", help="also save extracted landmarks to this cache directory")
+
+    replay = commands.add_parser("reclassify", help="transcribe a landmark cache with the current rules")
+    replay.add_argument("cache")
+    replay.add_argument("-o", "--output", help="transcript file (default: stdout)")
+
+    templates = commands.add_parser("templates", help="build nearest-neighbour templates from a labelled cache")
+    templates.add_argument("cache")
+    templates.add_argument("labels", help='JSON {"<frame>": "<gesture>", ...}')
+    templates.add_argument("-o", "--output", required=True, help="templates file (.npz)")
+
+    server = commands.add_parser("serve", help="publish gesture events for several cameras over TCP")
+    server.add_argument("sources", nargs="+", help="camera indexes or video/stream URLs")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8765)
+    server.add_argument("--fps", type=float, default=15.0, help="per-stream frame rate cap")
+    server.add_argument("-j", "--workers", type=int, help="inference threads (default: one per stream)")
+
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.command in ("transcribe", "reclassify"):
+        from transcribe import segments, transcribe, write_transcript
+
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            if args.command == "transcribe":
+                transcribe(args.video, gesture_dict, out, workers=args.workers,
+                           rules_file=GESTURE_RULES_FILE, templates_file=TEMPLATES_FILE, cache=args.cache)
+            else:
+                from landmark_cache import LandmarkCache
+
+                cache = LandmarkCache(args.cache)
+                write_transcript(segments(cache.frame_gestures(gesture_classifier), cache.fps), gesture_dict, out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    elif args.command == "templates":
+        classifier = TemplateClassifier.from_cache(args.cache, args.labels)
+        classifier.save(args.output)
+        print(f"{len(classifier)} templates written to {args.output}")
+    elif args.command == "serve":
+        import asyncio
+
+        from session_server import GestureSessionServer
+
+        sources = [int(source) if source.isdigit() else source for source in args.sources]
+        server = GestureSessionServer(sources, gesture_dict, gesture_classifier, max_workers=args.workers, fps_cap=args.fps)
+        try:
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        main(getattr(args, "camera", 0), getattr(args, "overlay", False), getattr(args, "metrics_port", None),
+             getattr(args, "headless", False), getattr(args, "events", None))
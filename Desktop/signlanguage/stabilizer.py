@@ -0,0 +1,119 @@
+import time
+from collections import Counter, deque
+
+
+class Sample:
+    """One frame's classification as seen by the stabilizer."""
+
+    __slots__ = ("label", "confidence", "wrist", "timestamp")
+
+    def __init__(self, label, confidence, wrist, timestamp):
+        self.label = label
+        self.confidence = confidence
+        self.wrist = wrist
+        self.timestamp = timestamp
+
+
+class GestureStabilizer:
+    """
+    Debounces per-frame gesture labels with a ring buffer and hysteresis.
+
+    A gesture becomes active once its confidence-weighted share of the last
+    `window` frames reaches `enter_ratio`, and is released when it drops below
+    `exit_ratio`. update() only returns a gesture on activation, so a label
+    flickering between two gestures does not trigger repeated speech.
+
+    Motion gestures (wave, clap, ...) plug in through add_motion_detector():
+    a detector receives the sample history and returns a gesture name or None.
+    """
+
+    def __init__(self, window=8, enter_ratio=0.6, exit_ratio=0.3, min_confidence=0.5):
+        if not 0 < exit_ratio <= enter_ratio <= 1:
+            raise ValueError("expected 0 < exit_ratio <= enter_ratio <= 1")
+
+        self.window = window
+        self.enter_ratio = enter_ratio
+        self.exit_ratio = exit_ratio
+        self.min_confidence = min_confidence
+
+        self.history = deque(maxlen=window)
+        self.current = None
+        self.motion_detectors = []
+
+        # frames since a motion detector last fired; motion gestures are held
+        # for a full window so they do not flap with the static labels
+        self._since_motion = window
+
+    def add_motion_detector(self, detector):
+        self.motion_detectors.append(detector)
+        return detector
+
+    def reset(self):
+        self.history.clear()
+        self.current = None
+        self._since_motion = self.window
+
+    def update(self, label, confidence=1.0, wrist=None, timestamp=None):
+        """
+        Feed one frame. Returns the gesture that just became active, else None.
+        """
+        if confidence < self.min_confidence:
+            label = None
+
+        sample = Sample(label, confidence, wrist, time.monotonic() if timestamp is None else timestamp)
+        self.history.append(sample)
+
+        self._since_motion += 1
+        for detector in self.motion_detectors:
+            gesture = detector(self.history)
+            if gesture:
+                self._since_motion = 0
+                if gesture == self.current:
+                    return None
+                self.current = gesture
+                return gesture
+
+        if self._since_motion < self.window:
+            return None
+
+        votes = Counter()
+        for s in self.history:
+            if s.label is not None:
+                votes[s.label] += s.confidence
+
+        if self.current is not None and votes[self.current] / self.window < self.exit_ratio:
+            self.current = None
+
+        if not votes:
+            return None
+
+        best, weight = votes.most_common(1)[0]
+        if best != self.current and weight / self.window >= self.enter_ratio:
+            self.current = best
+            return best
+
+        return None
+
+
+def detect_wave(history, min_swings=2, min_amplitude=0.05):
+    """
+    Motion detector: an open palm moving side to side is a "wave".
+    """
+    xs = [s.wrist[0] for s in history if s.label == "open_palm" and s.wrist is not None]
+    if len(xs) < history.maxlen // 2:
+        return None
+
+    swings = 0
+    direction = 0
+    anchor = xs[0]
+    for x in xs[1:]:
+        delta = x - anchor
+        if abs(delta) < min_amplitude:
+            continue
+        step = 1 if delta > 0 else -1
+        if direction and step != direction:
+            swings += 1
+        direction = step
+        anchor = x
+
+    return "wave" if swings >= min_swings else None
@@ -0,0 +1,195 @@
+import json
+
+import numpy as np
+
+from gesture_rules import RuleTable
+from landmark_cache import LandmarkCache
+from landmark_features import NUM_LANDMARKS, WRIST, landmarks_to_array
+
+MIDDLE_MCP = 9
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # optional: brute force is used without scipy
+    cKDTree = None
+
+
+def normalize(points):
+    """
+    Make hands comparable regardless of position, size and in-plane rotation.
+
+    Works on (..., 21, 3): the wrist moves to the origin, the wrist → middle MCP
+    bone is rotated onto -y (fingers up) and scaled to length 1.
+    Returns float32 (..., 63) vectors.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    centered = points - points[..., WRIST:WRIST + 1, :]
+
+    axis = centered[..., MIDDLE_MCP, :2]
+    length = np.sqrt(np.sum(axis * axis, axis=-1))
+    length = np.where(length > 0, length, 1.0)
+
+    # rotation that maps `axis` onto (0, -1)
+    cos = -axis[..., 1] / length
+    sin = -axis[..., 0] / length
+    x = centered[..., 0]
+    y = centered[..., 1]
+
+    rotated = np.stack(
+        (
+            cos[..., None] * x - sin[..., None] * y,
+            sin[..., None] * x + cos[..., None] * y,
+            centered[..., 2],
+        ),
+        axis=-1,
+    ) / length[..., None, None]
+
+    return rotated.reshape(points.shape[:-2] + (NUM_LANDMARKS * 3,)).astype(np.float32)
+
+
+class TemplateClassifier:
+    """
+    Nearest-neighbour gesture classifier over labelled landmark templates.
+
+    Templates live in one (M, 63) matrix of normalized hands. classify() picks
+    the closest template and returns its label when it is within
+    `max_distance`, otherwise None. With `use_tree` (and scipy installed) a
+    KD-tree index is built, which pays off for large template sets.
+    """
+
+    def __init__(self, max_distance=1.0, use_tree=False):
+        self.max_distance = max_distance
+        self.use_tree = use_tree
+
+        self.templates = np.empty((0, NUM_LANDMARKS * 3), dtype=np.float32)
+        self.labels = np.empty(0, dtype=object)
+        self._squared_norms = np.empty(0, dtype=np.float32)
+        self._tree = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def add(self, label, landmarks):
+        """Add one template, or a batch of templates sharing a label."""
+        points = landmarks_to_array(landmarks)
+        vectors = normalize(points).reshape(-1, NUM_LANDMARKS * 3)
+
+        self.templates = np.concatenate((self.templates, vectors))
+        self.labels = np.concatenate((self.labels, np.full(len(vectors), label, dtype=object)))
+        self._rebuild()
+
+    def _rebuild(self):
+        self._squared_norms = np.sum(self.templates * self.templates, axis=1)
+        self._tree = None
+        if self.use_tree and cKDTree is not None and len(self.templates):
+            self._tree = cKDTree(self.templates)
+
+    def save(self, path):
+        np.savez_compressed(path, templates=self.templates, labels=self.labels.astype(str))
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        data = np.load(path)
+        classifier = cls(**kwargs)
+        classifier.templates = data["templates"].astype(np.float32)
+        classifier.labels = data["labels"].astype(object)
+        classifier._rebuild()
+        return classifier
+
+    @classmethod
+    def from_cache(cls, path, labels_path, **kwargs):
+        """
+        Templates from a landmark cache: the first hand of every frame listed in
+        a JSON {"<frame>": "<gesture>"} label file.
+        """
+        cache = LandmarkCache(path)
+        with open(labels_path, "r") as f:
+            frame_labels = {int(k): v for k, v in json.load(f).items()}
+
+        classifier = cls(**kwargs)
+        frames = cache.index["frame"].tolist()
+        hands = cache.index["hands"].tolist()
+        keep = [i for i, frame in enumerate(frames) if hands[i] and frame_labels.get(frame)]
+
+        classifier.templates = normalize(np.asarray(cache.landmarks[keep, 0]))
+        classifier.labels = np.array([frame_labels[frames[i]] for i in keep], dtype=object)
+        classifier._rebuild()
+        return classifier
+
+    def nearest(self, vectors):
+        """(distances, template indices) of the closest template for (N, 63) vectors."""
+        if self._tree is not None:
+            distances, indices = self._tree.query(vectors)
+            return distances.astype(np.float32), indices
+
+        # |a - b|^2 = |a|^2 - 2ab + |b|^2, one matrix product for the whole batch
+        squared = (
+            np.sum(vectors * vectors, axis=1)[:, None]
+            - 2.0 * vectors @ self.templates.T
+            + self._squared_norms[None, :]
+        )
+        indices = np.argmin(squared, axis=1)
+        distances = np.sqrt(np.maximum(squared[np.arange(len(vectors)), indices], 0.0))
+        return distances, indices
+
+    def classify_batch(self, points):
+        """Labels for a batch of hands (N, 21, 3); None where nothing is close enough."""
+        if not len(self):
+            return [None] * len(points)
+
+        distances, indices = self.nearest(normalize(points))
+        labels = self.labels[indices]
+        return [label if d <= self.max_distance else None for label, d in zip(labels, distances)]
+
+    def classify(self, landmarks):
+        return self.classify_batch(landmarks_to_array(landmarks)[None])[0]
+
+
+class GestureClassifier:
+    """
+    Gesture rules first, then the nearest template for hands no rule matches.
+
+    Has the same classify / classify_batch / names interface as RuleTable, so
+    the live loop, the session server, transcription and cache re-classification
+    all go through one decision path. Batch indices past the rules refer to
+    template labels.
+    """
+
+    def __init__(self, rule_table, templates=None):
+        self.rule_table = rule_table
+        self.templates = templates if templates is not None and len(templates) else None
+
+        rule_names = [rule.name for rule in rule_table.rules]
+        self._template_names = sorted(set(self.templates.labels)) if self.templates is not None else []
+        self._template_index = {name: len(rule_names) + i for i, name in enumerate(self._template_names)}
+        self.names = np.array(rule_names + self._template_names + [None], dtype=object)
+
+    @classmethod
+    def from_files(cls, rules_file=None, templates_file=None):
+        """RuleTable from an optional rules JSON, plus optional templates (.npz)."""
+        rule_table = RuleTable.from_json(rules_file) if rules_file else RuleTable()
+        templates = TemplateClassifier.load(templates_file) if templates_file else None
+        return cls(rule_table, templates)
+
+    @property
+    def phrases(self):
+        return self.rule_table.phrases
+
+    def classify(self, features):
+        gesture = self.rule_table.classify(features)
+        if gesture is None and self.templates is not None:
+            gesture = self.templates.classify(features.points)
+        return gesture
+
+    def classify_batch(self, features):
+        """Indices into `names` with the batch shape, -1 where nothing matched."""
+        result = self.rule_table.classify_batch(features)
+        if self.templates is None:
+            return result
+
+        # absent hands (NaN rows in a landmark cache) are not worth a template search
+        missed = (result == -1) & np.isfinite(features.points).all(axis=(-2, -1))
+        if missed.any():
+            labels = self.templates.classify_batch(features.points[missed])
+            result[missed] = [self._template_index.get(label, -1) for label in labels]
+        return result
@@ -0,0 +1,183 @@
+import itertools
+import multiprocessing
+import os
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from landmark_cache import LandmarkCacheWriter
+from landmark_features import LandmarkFeatures, landmarks_to_array
+from template_classifier import GestureClassifier
+
+# Per-worker state, created once by _init_worker
+_min_detection_confidence = None
+_classifier = None
+
+
+def frame_ranges(total_frames, chunks):
+    """Split [0, total_frames) into `chunks` contiguous (start, stop) ranges."""
+    chunks = max(1, min(chunks, total_frames))
+    step, extra = divmod(total_frames, chunks)
+
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + step + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _init_worker(rules_file, templates_file, min_detection_confidence):
+    global _min_detection_confidence, _classifier
+    _min_detection_confidence = min_detection_confidence
+    _classifier = GestureClassifier.from_files(rules_file, templates_file)
+
+
+def _process_range(job):
+    """
+    Worker: classify every frame in [start, stop); stop=None reads to the end.
+
+    Returns [(frame, [gesture, ...], points), ...] where points is the
+    (hands, 21, 3) landmark array, or None when no hand was found.
+
+    Every range gets a fresh Hands graph: a worker's ranges are not adjacent,
+    so tracking state carried over from its previous range would seed the
+    first frames here with landmarks from an unrelated part of the video.
+    """
+    path, start, stop = job
+
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    hands = mp.solutions.hands.Hands(min_detection_confidence=_min_detection_confidence)
+
+    frames = []
+    try:
+        indexes = range(start, stop) if stop is not None else itertools.count(start)
+        for index in indexes:
+            ok, image = cap.read()
+            if not ok:
+                break
+
+            results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            gestures, points = [], None
+            if results.multi_hand_landmarks:
+                points = np.stack([landmarks_to_array(h) for h in results.multi_hand_landmarks])
+                for hand_points in points:
+                    gestures.append(_classifier.classify(LandmarkFeatures(hand_points)))
+
+            frames.append((index, gestures, points))
+    finally:
+        hands.close()
+        cap.release()
+
+    return frames
+
+
+def video_info(path):
+    """(fps, frame_count) of a video file; frame_count is <= 0 when the container does not say."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+    return fps, total
+
+
+def classify_video(path, workers=None, rules_file=None, min_detection_confidence=0.7, chunks_per_worker=4,
+                   total_frames=None, templates_file=None):
+    """
+    Run landmark extraction + gesture rules (and templates, for hands no rule
+    matches) over a whole video on a process pool.
+
+    Every contiguous frame range runs through its own MediaPipe Hands graph,
+    so tracking works inside a range and never leaks across ranges. Ranges
+    are smaller than total/workers to keep every core busy until the end.
+
+    When the frame count is unknown (streams, some containers) the video
+    can't be split, and a single worker reads it sequentially instead.
+
+    Yields (frame_index, [gesture, ...], points) in frame order.
+    """
+    if total_frames is None:
+        _, total_frames = video_info(path)
+
+    if total_frames > 0:
+        workers = workers or os.cpu_count() or 1
+        jobs = [(path, start, stop) for start, stop in frame_ranges(total_frames, workers * chunks_per_worker)]
+    else:
+        workers = 1
+        jobs = [(path, 0, None)]
+
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(rules_file, templates_file, min_detection_confidence),
+    ) as pool:
+        for frames in pool.imap(_process_range, jobs):
+            yield from frames
+
+
+def segments(frames, fps, min_frames=3):
+    """
+    Collapse per-frame gestures into (start_sec, end_sec, gesture) segments.
+
+    The first recognized gesture of each frame is used; runs shorter than
+    min_frames are treated as noise.
+    """
+    result = []
+    current, run_start, last_index = None, 0, -1
+
+    def close():
+        if current and last_index - run_start + 1 >= min_frames:
+            result.append((run_start / fps, (last_index + 1) / fps, current))
+
+    for index, gestures, *_ in frames:
+        gesture = next((g for g in gestures if g), None)
+        if gesture != current or index != last_index + 1:
+            close()
+            current, run_start = gesture, index
+        last_index = index
+
+    close()
+    return result
+
+
+def format_timestamp(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
+
+
+def write_transcript(segments, phrases, out):
+    for start, end, gesture in segments:
+        out.write(f"{format_timestamp(start)} --> {format_timestamp(end)}  {phrases.get(gesture, gesture)}  [{gesture}]\n")
+
+
+def cached(frames, writer):
+    """Pass frames through while appending their landmarks to a LandmarkCacheWriter."""
+    for frame in frames:
+        writer.append(frame[0], frame[2])
+        yield frame
+
+
+def transcribe(path, phrases, out, workers=None, rules_file=None, cache=None, templates_file=None):
+    """
+    Transcribe a recorded video into timestamped phrases written to `out`.
+
+    With `cache` set, the extracted landmarks are also saved to that directory
+    so the video can later be re-classified without MediaPipe.
+    """
+    fps, total_frames = video_info(path)
+    frames = classify_video(path, workers, rules_file, total_frames=total_frames, templates_file=templates_file)
+
+    if cache is None:
+        write_transcript(segments(frames, fps), phrases, out)
+        return
+
+    with LandmarkCacheWriter(cache, fps, source=path) as writer:
+        write_transcript(segments(cached(frames, writer), fps), phrases, out)
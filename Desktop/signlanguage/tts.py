@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import deque
+
+
+class SpeechWorker:
+    """
+    Text-to-speech on a dedicated thread, so runAndWait never blocks recognition.
+
+    - a phrase already queued or currently being spoken is coalesced
+    - the same phrase is suppressed for `cooldown` seconds after it was spoken
+    - the queue holds at most `maxsize` phrases; newer gestures push out older
+      ones, and anything that waited longer than `max_age` seconds is dropped
+
+    :param engine_factory: callable returning a pyttsx3 style engine; it is called
+                           on the worker thread, which then owns the engine
+    """
+
+    def __init__(self, engine_factory, cooldown=2.0, max_age=1.0, maxsize=1):
+        self.engine_factory = engine_factory
+        self.cooldown = cooldown
+        self.max_age = max_age
+
+        self._pending = deque(maxlen=maxsize)
+        self._speaking = None
+        self._last_spoken = {}
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.spoken = 0
+        self.coalesced = 0
+        self.suppressed = 0
+        self.dropped = 0
+
+    def start(self):
+        """Start the worker thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the worker once the current utterance is finished."""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def say(self, phrase):
+        """Queue a phrase; returns False if it was coalesced or is cooling down."""
+        now = time.monotonic()
+
+        with self._cond:
+            if phrase == self._speaking or any(p == phrase for p, _ in self._pending):
+                self.coalesced += 1
+                return False
+
+            if now - self._last_spoken.get(phrase, float("-inf")) < self.cooldown:
+                self.suppressed += 1
+                return False
+
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append((phrase, now))
+            self._cond.notify()
+
+        return True
+
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+
+    def _next_phrase(self):
+        with self._cond:
+            while not self._pending and not self._stop_event.is_set():
+                self._cond.wait()
+
+            now = time.monotonic()
+            while self._pending:
+                phrase, queued_at = self._pending.popleft()
+                if now - queued_at <= self.max_age:
+                    self._speaking = phrase
+                    self._last_spoken[phrase] = now
+                    return phrase
+                self.dropped += 1
+
+        return None
+
+    def _run(self):
+        engine = self.engine_factory()
+
+        while not self._stop_event.is_set():
+            phrase = self._next_phrase()
+            if phrase is None:
+                continue
+
+            engine.say(phrase)
+            engine.runAndWait()
+
+            with self._cond:
+                self._speaking = None
+                self._last_spoken[phrase] = time.monotonic()
+                self.spoken += 1